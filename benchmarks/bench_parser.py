@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+解析器基准测试
+对比逐节点 XPath 子查询的旧写法与预编译 XPath 单次遍历的新写法，
+使用 fixtures/ 下由 gen_fixtures.py 生成的合成页面（非真实保存的首页），只统计 parse_list 本身的耗时。
+
+用法：python benchmarks/bench_parser.py [--rounds 50]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR.parent))
+
+from parsel import Selector  # noqa: E402
+from collector.parser import NeteaseParser, SinaParser  # noqa: E402
+from collector.protocol import ParsedItem  # noqa: E402
+
+
+def legacy_sina(selector: Selector) -> List[ParsedItem]:
+    """优化前的 SinaParser.parse_list"""
+    items = []
+    hot_list = selector.xpath('//div[contains(@class, "blk_card")]//ul[contains(@class, "uni-blk-list") and contains(@class, "list-a")]/li/a')
+    for a in hot_list[:10]:
+        href = a.xpath('@href').get()
+        title = a.xpath('text()').get() or a.xpath('string(.)').get()
+        if href and title and href.startswith("http"):
+            items.append(ParsedItem(title=title.strip(), url=href, source="sina"))
+    yaowen_headlines = selector.xpath('//div[@id="blk_yw_01"]//h1[contains(@data-client, "headline")]/a')
+    for a in yaowen_headlines[:5]:
+        href = a.xpath('@href').get()
+        title = a.xpath('text()').get() or a.xpath('string(.)').get()
+        if href and title and href.startswith("http"):
+            items.append(ParsedItem(title=title.strip(), url=href, source="sina"))
+    return items
+
+
+def legacy_netease(selector: Selector) -> List[ParsedItem]:
+    """优化前的 NeteaseParser.parse_list"""
+    items = []
+    containers = selector.xpath('//div[contains(@class, "news_df_yw")]')
+    if not containers:
+        containers = selector.xpath('//div[@class="ns_area"]')
+    for container in containers:
+        for a in container.xpath('.//a[@href]'):
+            href = a.xpath('@href').get()
+            title = a.xpath('string(.)').get()
+            if href and title and href.startswith("http"):
+                title = title.strip()
+                if title:
+                    items.append(ParsedItem(title=title, url=href, source="163"))
+    if not items:
+        for a in selector.xpath('//a[@href]'):
+            href = a.xpath('@href').get()
+            title = a.xpath('string(.)').get()
+            if href and title and href.startswith("http"):
+                title = title.strip()
+                if title and len(title) > 5 and "163.com" in href:
+                    items.append(ParsedItem(title=title, url=href, source="163"))
+    return items
+
+
+CASES: Dict[str, Dict[str, Callable[[Selector], List[ParsedItem]]]] = {
+    "sina": {"legacy": legacy_sina, "compiled": SinaParser().parse_list},
+    "163": {"legacy": legacy_netease, "compiled": NeteaseParser().parse_list},
+}
+
+# 去掉要闻容器，走 ns_area 兜底分支
+VARIANTS: Dict[str, Callable[[str], str]] = {
+    "sina": lambda html: html,
+    "163": lambda html: html,
+    "163-ns": lambda html: html.replace("news_df_yw", "news_df_off"),
+}
+
+
+def bench(rounds: int) -> None:
+    print(f"{'page':<8}{'size':>10}{'items':>8}{'legacy ms':>12}{'compiled ms':>14}{'speedup':>10}")
+    for name, variant in VARIANTS.items():
+        fixture = name.split("-")[0]
+        funcs = CASES[fixture]
+        html = variant((BASE_DIR / "fixtures" / f"{fixture}.html").read_text(encoding="utf-8"))
+        selector = Selector(text=html)
+
+        expected = funcs["legacy"](selector)
+        actual = funcs["compiled"](selector)
+        if expected != actual:
+            raise SystemExit(f"{name}: compiled parser output differs from legacy parser")
+
+        timings = {
+            label: min(timeit.repeat(lambda f=func: f(selector), number=1, repeat=rounds)) * 1000
+            for label, func in funcs.items()
+        }
+        print(
+            f"{name:<8}{len(html.encode('utf-8')):>10}{len(actual):>8}"
+            f"{timings['legacy']:>12.2f}{timings['compiled']:>14.2f}"
+            f"{timings['legacy'] / timings['compiled']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NewsFlow parser benchmark")
+    parser.add_argument("--rounds", type=int, default=50, help="每个页面的重复次数，取最快一次")
+    bench(parser.parse_args().rounds)
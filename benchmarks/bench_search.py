@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+标题全文检索基准测试
+向临时 ItemStore 写入随机生成的中文标题，统计写入吞吐与 /collect/search 查询耗时。
+
+用法：python benchmarks/bench_search.py [--items 1000000] [--batch 2000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from collector.protocol import ParsedItem  # noqa: E402
+from collector.store import ItemStore  # noqa: E402
+
+# 常用字，按字频近似排列，越靠前被选中的概率越高
+CHARS = (
+    "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面"
+    "而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性"
+    "好应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第"
+    "向道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管"
+    "特件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处"
+)
+WEIGHTS = [1 / (i + 10) for i in range(len(CHARS))]
+QUERIES = ["中国", "发展 经济", "芯片", "新能源汽车", "国", "人工智能 产业"]
+
+
+def make_title(rng: random.Random) -> str:
+    return "".join(rng.choices(CHARS, weights=WEIGHTS, k=rng.randint(12, 28)))
+
+
+def bench(count: int, batch: int) -> None:
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ItemStore(str(Path(directory) / "items.db"))
+        started = time.perf_counter()
+        for start in range(0, count, batch):
+            store.add([
+                ParsedItem(make_title(rng), f"https://example.com/{i}", rng.choice(["sina", "163", "tencent"]))
+                for i in range(start, min(count, start + batch))
+            ])
+        elapsed = time.perf_counter() - started
+        print(f"indexed {count} items in {elapsed:.1f}s ({count / elapsed:.0f} items/s)")
+
+        print(f"{'query':<16}{'hits':>6}{'median ms':>12}{'max ms':>10}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(20):
+                started = time.perf_counter()
+                hits = store.search(query, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{query:<16}{len(hits):>6}{statistics.median(timings):>12.2f}{max(timings):>10.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NewsFlow search benchmark")
+    parser.add_argument("--items", type=int, default=1000000, help="写入的条目数量")
+    parser.add_argument("--batch", type=int, default=2000, help="每次写入的条目数量")
+    args = parser.parse_args()
+    bench(args.items, args.batch)
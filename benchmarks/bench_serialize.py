@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+条目序列化基准测试
+对比 dataclass ParsedItem + pydantic CollectResponse 的旧路径与
+__slots__ ParsedItem 交给 orjson 直接编码的新路径，统计每千条数据的条目内存、
+编码过程的额外峰值内存与序列化耗时。
+
+用法：python benchmarks/bench_serialize.py [--items 1000] [--rounds 50]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from collector.protocol import ParsedItem, dumps  # noqa: E402
+from services.collector.schemas import CollectResponse  # noqa: E402
+
+
+@dataclass
+class LegacyItem:
+    """优化前的 ParsedItem"""
+    title: str
+    url: str
+    source: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"title": self.title, "url": self.url}
+        if self.source:
+            result["source"] = self.source
+        return result
+
+
+def make_items(cls: type, count: int) -> List[Any]:
+    return [
+        cls(f"第{i}条新闻标题：某地发布重要通知", f"https://news.sina.com.cn/c/2024-01-01/doc-{i:08d}.shtml", "sina")
+        for i in range(count)
+    ]
+
+
+def legacy_encode(items: List[LegacyItem]) -> bytes:
+    response = CollectResponse(
+        status="success",
+        total_sources=1,
+        items_by_source={"sina": [item.to_dict() for item in items]},
+        total_items=len(items),
+    )
+    return json.dumps(response.model_dump(), ensure_ascii=False).encode("utf-8")
+
+
+def fast_encode(items: List[ParsedItem]) -> bytes:
+    return dumps({
+        "status": "success",
+        "total_sources": 1,
+        "items_by_source": {"sina": items},
+        "total_items": len(items),
+        "errors": None,
+    })
+
+
+def measure_memory(cls: type, count: int) -> int:
+    tracemalloc.start()
+    items = make_items(cls, count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def measure_encode_peak(encode: Callable[[List[Any]], bytes], items: List[Any]) -> int:
+    """编码过程中除结果字节外的峰值内存"""
+    tracemalloc.start()
+    encoded = encode(items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - len(encoded)
+
+
+def bench(count: int, rounds: int) -> None:
+    cases: Dict[str, Dict[str, Any]] = {
+        "legacy": {"cls": LegacyItem, "encode": legacy_encode},
+        "slots+orjson": {"cls": ParsedItem, "encode": fast_encode},
+    }
+    print(f"{'path':<14}{'KiB/1k items':>14}{'encode KiB/1k':>15}{'encode ms/1k':>14}")
+    for name, case in cases.items():
+        items = make_items(case["cls"], count)
+        encode: Callable[[List[Any]], bytes] = case["encode"]
+        seconds = min(timeit.repeat(lambda: encode(items), number=1, repeat=rounds))
+        memory = measure_memory(case["cls"], count)
+        peak = measure_encode_peak(encode, items)
+        print(
+            f"{name:<14}{memory / 1024 * 1000 / count:>14.1f}{peak / 1024 * 1000 / count:>15.1f}"
+            f"{seconds * 1000 * 1000 / count:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NewsFlow serialisation benchmark")
+    parser.add_argument("--items", type=int, default=1000, help="条目数量")
+    parser.add_argument("--rounds", type=int, default=50, help="重复次数，取最快一次")
+    args = parser.parse_args()
+    bench(args.items, args.rounds)
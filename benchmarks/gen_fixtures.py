@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+生成解析器基准使用的合成页面
+fixtures/ 下的 sina.html 与 163.html 不是真实保存的页面，而是由本脚本按固定随机种子生成：
+只模仿新浪、网易首页中解析器关心的结构（要闻区、热点列表），其余为随机汉字标题、
+导航、图片（img.example.com）与脚本片段组成的干扰节点。重新运行会得到逐字节相同的文件。
+
+用法：python benchmarks/gen_fixtures.py [--seed 20261018]
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+CHARS = (
+    "的一是不了人我在有他这为之大来以个中上们到说国和地也子时道出而要于就下得可你年生自会那后能对着事其里所去行过家十"
+    "用发天如然作方成者多日都三小军二无同么经法当起与好看学进种将还分此心前面又定见只主没公从"
+)
+
+
+def title(rng: random.Random, n: int = 0) -> str:
+    return "".join(rng.choice(CHARS) for _ in range(n or rng.randint(8, 28)))
+
+
+def noise(rng: random.Random, count: int, domain: str) -> str:
+    """解析器不应命中的干扰节点：外链列表、站内导航、图片卡片与内联脚本"""
+    out = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.5:
+            out.append(f'<li><a href="https://{domain}/{rng.randint(1, 10 ** 8)}.html" target="_blank">{title(rng)}</a></li>')
+        elif kind < 0.7:
+            out.append(f'<li><a href="/{rng.randint(1, 999)}/"><span class="ico"></span>{title(rng, 4)}</a><em>{title(rng, 3)}</em></li>')
+        elif kind < 0.85:
+            out.append(
+                f'<div class="pic"><a href="https://{domain}/p/{i}.html"><img src="//img.example.com/{i}.jpg" '
+                f'alt="{title(rng)}"/></a><p>{title(rng, 40)}</p></div>'
+            )
+        else:
+            out.append(f'<script>var cfg{i}={{"id":{i},"v":"{title(rng, 10)}"}};</script>')
+    return "\n".join(out)
+
+
+def sina_page(rng: random.Random) -> str:
+    """要闻区 6 条 headline 与 40 个 blk_card 热点列表，夹在大量干扰节点之间"""
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>新浪新闻中心</title></head><body>']
+    parts.append('<div class="top-nav"><ul>' + noise(rng, 400, "news.sina.com.cn") + "</ul></div>")
+    parts.append('<div id="blk_yw_01" class="blk_yw">')
+    for i in range(6):
+        parts.append(
+            f'<h1 data-client="headline"><a href="https://news.sina.com.cn/c/2026-10-18/doc-yw{i}.shtml" '
+            f'target="_blank">{title(rng)}</a></h1>'
+        )
+    parts.append("<ul>" + noise(rng, 60, "news.sina.com.cn") + "</ul></div>")
+    for blk in range(40):
+        parts.append(f'<div class="blk_card card_{blk}"><div class="blk_hd">{title(rng, 4)}</div><ul class="uni-blk-list list-a">')
+        for j in range(12):
+            parts.append(
+                f'<li><a href="https://news.sina.com.cn/w/2026-10-18/doc-{blk}-{j}.shtml" target="_blank">{title(rng)}</a></li>'
+            )
+        parts.append("</ul><ul>" + noise(rng, 40, "news.sina.com.cn") + "</ul></div>")
+    parts.append('<div class="footer"><ul>' + noise(rng, 500, "sina.com.cn") + "</ul></div></body></html>")
+    return "\n".join(parts)
+
+
+def netease_page(rng: random.Random) -> str:
+    """要闻 tab 60 条（标题前带 span 子节点），其后 30 个版块与页脚的干扰节点"""
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>网易</title></head><body>']
+    parts.append('<div class="ntes-nav"><ul>' + noise(rng, 500, "www.163.com") + "</ul></div>")
+    parts.append('<div class="mod_news_tab"><div class="news_df_yw tab_main">')
+    for j in range(60):
+        parts.append(
+            f'<li><a href="https://www.163.com/news/article/YW{j:04d}.html"><span>{title(rng, 6)}</span>{title(rng)}</a></li>'
+        )
+    parts.append("</div></div>")
+    for sec in range(30):
+        parts.append(f'<div class="ns_area mod_{sec}"><ul>' + noise(rng, 50, "www.163.com") + "</ul></div>")
+    parts.append('<div class="footer"><ul>' + noise(rng, 600, "163.com") + "</ul></div></body></html>")
+    return "\n".join(parts)
+
+
+def main(seed: int) -> None:
+    # 两个页面共用一个随机序列，顺序不能调换，否则生成的文件与仓库中的不同
+    rng = random.Random(seed)
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    for name, build in (("sina.html", sina_page), ("163.html", netease_page)):
+        path = FIXTURES_DIR / name
+        path.write_text(build(rng), encoding="utf-8")
+        print(f"wrote {path} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic parser benchmark pages")
+    parser.add_argument("--seed", type=int, default=20261018, help="随机种子")
+    main(parser.parse_args().seed)
@@ -0,0 +1,290 @@
+import gzip
+import hashlib
+import mmap
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config import settings
+from .sqlite import SQLiteStore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard 为可选依赖
+    zstandard = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tag TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    encoding TEXT,
+    body_hash BLOB NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    codec TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_tag ON snapshots (tag, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_fetched_at ON snapshots (fetched_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots (url, id);
+"""
+
+
+@dataclass
+class Snapshot:
+    id: int
+    tag: str
+    url: str
+    fetched_at: float
+    encoding: Optional[str]
+    segment: str
+    offset: int
+    length: int
+    codec: str
+
+
+class SnapshotArchive(SQLiteStore):
+    """原始页面快照归档
+
+    每个页面正文单独压缩（gzip，安装了 zstandard 时可选 zstd）后追加到段文件末尾，
+    段文件所在位置、偏移与长度记录在同目录的 SQLite 索引中。段文件只追加、不修改，
+    达到 segment_size 字节或 segment_age 秒后换新段；读取时以 mmap 映射段文件，
+    按索引中的偏移直接切出记录。
+
+    同一 URL 的正文与上一份快照相同时不重复归档。段文件名带创建时间与进程号，
+    多个 worker 各写各的段，共享同一份索引。超过 retention 秒的整段连同索引一起删除，
+    换段时与 prune() 被定期调用时执行。
+
+    Example:
+        archive = SnapshotArchive("data/archive")
+        archive.append("https://news.sina.com.cn/", "sina", body, "utf-8")
+        for snapshot in archive.snapshots(tags=["sina"], start=time.time() - 86400):
+            body = archive.read(snapshot)
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        codec: Optional[str] = None,
+        segment_size: Optional[int] = None,
+        segment_age: Optional[float] = None,
+        retention: Optional[float] = None,
+    ):
+        self.directory = Path(directory or settings.archive_path)
+        self.codec = codec or settings.archive_codec
+        self.segment_size = segment_size or settings.archive_segment_size
+        self.segment_age = segment_age or settings.archive_segment_age
+        self.retention = retention or settings.archive_retention
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("archive_codec 'zstd' requires the zstandard package")
+        if self.codec not in ("gzip", "zstd"):
+            raise ValueError(f"Unknown archive codec: {self.codec}")
+        if self.segment_age >= self.retention:
+            raise ValueError(
+                f"archive segment_age ({self.segment_age}) must be less than retention ({self.retention})"
+            )
+
+        super().__init__(str(self.directory / "index.db"), _SCHEMA)
+
+        self._segment: Optional[str] = None
+        self._segment_started = 0.0
+        self._file = None
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._written = 0
+        self._skipped = 0
+        # 由调用方记录归档失败，归档失败不应影响采集
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    def append(
+        self,
+        url: str,
+        tag: str,
+        body: bytes,
+        encoding: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+    ) -> bool:
+        """归档一份页面正文
+
+        Returns:
+            是否写入，与该 URL 上一份快照相同时为 False
+        """
+        fetched_at = fetched_at or time.time()
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        with self._lock:
+            last = self._conn.execute(
+                "SELECT body_hash FROM snapshots WHERE url = ? ORDER BY id DESC LIMIT 1", (url,)
+            ).fetchone()
+            if last is not None and last["body_hash"] == body_hash:
+                self._skipped += 1
+                return False
+
+        # 压缩不持锁，并发归档的页面可以同时压缩
+        record = _compress(self.codec, body)
+        with self._lock:
+            rolled = self._file is None or self._should_roll(fetched_at)
+            if rolled:
+                self._roll(fetched_at)
+            offset = self._file.tell()
+            self._file.write(record)
+            self._file.flush()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO snapshots "
+                    "(tag, url, fetched_at, encoding, body_hash, segment, offset, length, codec) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (tag, url, fetched_at, encoding, body_hash, self._segment, offset, len(record), self.codec),
+                )
+            self._written += 1
+        if rolled:
+            self.prune(fetched_at)
+        return True
+
+    def snapshots(
+        self,
+        tags: Optional[List[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Snapshot]:
+        """按抓取时间顺序列出时间范围内的快照（不含正文）
+
+        Args:
+            tags: 只列出这些标识（数据源名）的快照，为空时列出全部
+            start: 起始时间戳（含）
+            end: 结束时间戳（不含）
+        """
+        query = (
+            "SELECT id, tag, url, fetched_at, encoding, segment, offset, length, codec "
+            "FROM snapshots WHERE 1 = 1"
+        )
+        params: List[Any] = []
+        if tags:
+            query += f" AND tag IN ({','.join('?' for _ in tags)})"
+            params.extend(tags)
+        if start is not None:
+            query += " AND fetched_at >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND fetched_at < ?"
+            params.append(end)
+        query += " ORDER BY fetched_at, id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [Snapshot(**dict(row)) for row in rows]
+
+    def read(self, snapshot: Snapshot) -> bytes:
+        """读取并解压一份快照的正文"""
+        with self._lock:
+            view = self._map(snapshot.segment, snapshot.offset + snapshot.length)
+            record = view[snapshot.offset:snapshot.offset + snapshot.length]
+        return _decompress(snapshot.codec, record)
+
+    def iter_bodies(
+        self,
+        tags: Optional[List[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Iterator[Tuple[Snapshot, bytes]]:
+        """按抓取时间顺序逐个产出时间范围内的快照与正文"""
+        for snapshot in self.snapshots(tags, start, end):
+            yield snapshot, self.read(snapshot)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, segments, stored = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT segment), COALESCE(SUM(length), 0) FROM snapshots"
+            ).fetchone()
+        return {
+            "codec": self.codec,
+            "snapshots": count,
+            "segments": segments,
+            "stored_bytes": stored,
+            "written": self._written,
+            "skipped": self._skipped,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+        super().close()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """删除超过保留期的段，返回删除的段数
+
+        段内最新一份快照超过保留期、且段已不可能再被写入时才删除：
+        不删本进程正在写的段；其他进程的段按文件名中的创建时间判断，
+        创建超过 segment_age 秒后写入方下次归档前必然换段。
+        """
+        now = now or time.time()
+        with self._lock:
+            cutoff = now - self.retention
+            expired = [
+                row["segment"]
+                for row in self._conn.execute(
+                    "SELECT segment FROM snapshots GROUP BY segment HAVING MAX(fetched_at) < ?", (cutoff,)
+                ).fetchall()
+                if row["segment"] != self._segment and _segment_started(row["segment"]) + self.segment_age <= now
+            ]
+            if not expired:
+                return 0
+            with self._conn:
+                self._conn.executemany("DELETE FROM snapshots WHERE segment = ?", [(name,) for name in expired])
+            for name in expired:
+                view = self._maps.pop(name, None)
+                if view is not None:
+                    view.close()
+                (self.directory / name).unlink(missing_ok=True)
+        return len(expired)
+
+    def _should_roll(self, now: float) -> bool:
+        return self._file.tell() >= self.segment_size or now - self._segment_started >= self.segment_age
+
+    def _roll(self, now: float) -> None:
+        """换新段"""
+        if self._file is not None:
+            self._file.close()
+        self._segment = f"{int(now * 1000)}-{os.getpid()}.seg"
+        self._segment_started = now
+        self._file = open(self.directory / self._segment, "ab")
+
+    def _map(self, segment: str, end: int) -> mmap.mmap:
+        """返回段文件的只读映射，正在追加的段长度不足时重新映射"""
+        view = self._maps.get(segment)
+        if view is None or len(view) < end:
+            if view is not None:
+                view.close()
+            with open(self.directory / segment, "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = view
+        return view
+
+
+def _segment_started(name: str) -> float:
+    """段文件名 <毫秒时间戳>-<进程号>.seg 中的创建时间"""
+    return int(name.split("-", 1)[0]) / 1000
+
+
+def _compress(codec: str, body: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _decompress(codec: str, record: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd snapshots requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(record)
+    return gzip.decompress(record)
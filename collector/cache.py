@@ -0,0 +1,106 @@
+import asyncio
+import dataclasses
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from config import settings
+from .engine import SourceResult
+
+
+class ResultCache:
+    """按数据源缓存采集结果
+
+    - 结果在 ttl 秒内直接复用，超出 max_items 条数据时按最近最少使用淘汰
+    - 同一数据源的并发请求合并为一次采集，其余请求等待同一结果
+    - 采集出错的结果不缓存
+
+    Example:
+        cache = ResultCache(ttl=30)
+        result = await cache.get_or_fetch("sina", lambda: collect_source(client, "sina"))
+        result.from_cache, result.age
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_items: Optional[int] = None):
+        self.ttl = settings.result_cache_ttl if ttl is None else ttl
+        self.max_items = settings.result_cache_max_items if max_items is None else max_items
+        self._entries: "OrderedDict[str, Tuple[SourceResult, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(
+        self,
+        source: str,
+        fetch: Callable[[], Awaitable[SourceResult]],
+    ) -> SourceResult:
+        """返回缓存结果，未命中时采集并写入缓存
+
+        Args:
+            source: 数据源标识
+            fetch: 未命中时执行的采集函数
+
+        Returns:
+            采集结果，命中缓存时 from_cache 为 True，age 为缓存时长（秒）
+        """
+        cached = self.get(source)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(source)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(source, fetch))
+            self._inflight[source] = task
+            task.add_done_callback(lambda done: self._forget(source, done))
+        # 单个调用方被取消时不影响其他等待同一结果的请求
+        return await asyncio.shield(task)
+
+    def get(self, source: str) -> Optional[SourceResult]:
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        result, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age >= self.ttl:
+            self._evict(source)
+            return None
+        self._entries.move_to_end(source)
+        self.hits += 1
+        return dataclasses.replace(result, from_cache=True, age=age)
+
+    def put(self, source: str, result: SourceResult) -> None:
+        if self.ttl <= 0 or self.max_items <= 0 or result.error or len(result.items) > self.max_items:
+            return
+        self._evict(source)
+        self._entries[source] = (result, time.monotonic())
+        self._size += len(result.items)
+        while self._size > self.max_items:
+            self._evict(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "items": self._size,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    async def _fill(self, source: str, fetch: Callable[[], Awaitable[SourceResult]]) -> SourceResult:
+        result = await fetch()
+        self.put(source, result)
+        return result
+
+    def _forget(self, source: str, task: asyncio.Task) -> None:
+        if self._inflight.get(source) is task:
+            del self._inflight[source]
+
+    def _evict(self, source: str) -> None:
+        entry = self._entries.pop(source, None)
+        if entry is not None:
+            self._size -= len(entry[0].items)
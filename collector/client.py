@@ -1,8 +1,36 @@
 import asyncio
+import hashlib
+import time
 import httpx
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 from parsel import Selector
 from config import settings
+from .archive import SnapshotArchive
+from .hosts import HostPool
+from .protocol import ParsedItem
+
+
+@dataclass
+class CachedPage:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[bytes] = None
+    tag: Optional[str] = None
+    items: Optional[List[ParsedItem]] = None
+
+
+@dataclass
+class Page:
+    url: str
+    response: httpx.Response
+    items: Optional[List[ParsedItem]] = None
+
+    @property
+    def unchanged(self) -> bool:
+        """页面与上次相同，items 为上次的解析结果"""
+        return self.items is not None
 
 
 class CollectorClient:
@@ -11,12 +39,28 @@ class CollectorClient:
         timeout: Optional[float] = None,
         follow_redirects: bool = True,
         headers: Optional[Dict[str, str]] = None,
+        limits: Optional[httpx.Limits] = None,
+        page_cache_size: Optional[int] = None,
+        hosts: Optional[HostPool] = None,
+        archive: Optional[SnapshotArchive] = None,
     ):
         self.timeout = timeout or settings.timeout
+        self.page_cache_size = settings.page_cache_size if page_cache_size is None else page_cache_size
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self.hosts = hosts or HostPool()
+        self.archive = archive
         self.client = httpx.AsyncClient(
             timeout=self.timeout,
             follow_redirects=follow_redirects,
             headers=headers or self._default_headers(),
+            limits=limits or self._default_limits(),
+        )
+
+    def _default_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.pool_max_connections,
+            max_keepalive_connections=settings.pool_max_keepalive,
+            keepalive_expiry=settings.pool_keepalive_expiry,
         )
 
     def _default_headers(self) -> Dict[str, str]:
@@ -26,23 +70,115 @@ class CollectorClient:
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         }
 
-    async def get(self, url: str, **kwargs) -> Selector:
-        response = await self.client.get(url, **kwargs)
+    async def _request(self, url: str, **kwargs) -> httpx.Response:
+        """经过主机并发控制与熔断的 GET 请求
+
+        网络错误、超时、5xx 与 429 计为失败，其余响应计为成功。
+        未指定 timeout 时使用按主机延迟推算的超时。
+        """
+        host = self.hosts.get(url)
+        generation = await host.acquire()
+        kwargs.setdefault("timeout", host.timeout())
+        started = time.monotonic()
+        ok: Optional[bool] = None
+        try:
+            response = await self.client.get(url, **kwargs)
+            ok = response.status_code < 500 and response.status_code != 429
+            return response
+        except httpx.TransportError:
+            ok = False
+            raise
+        finally:
+            await host.release(ok, time.monotonic() - started, generation)
+
+    async def fetch(self, url: str, **kwargs) -> httpx.Response:
+        response = await self._request(url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def fetch_page(self, url: str, tag: str) -> Page:
+        """条件请求页面
+
+        同一 tag 已缓存解析结果时携带 If-None-Match / If-Modified-Since，
+        返回 304 或正文摘要与上次相同时直接带回上次的解析结果，无需重新解析。
+        配置了 archive 时，正文有变化的页面会归档一份快照，归档失败不影响本次请求。
+
+        Args:
+            url: 页面地址
+            tag: 解析结果的标识（如数据源名），不同解析方式互不复用
+
+        Returns:
+            Page，页面未变化时 items 为缓存的解析结果
+        """
+        cached = self._pages.get(url)
+        if cached is None or cached.tag != tag or cached.items is None:
+            cached = None
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._request(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self._pages.move_to_end(url)
+            return Page(url=url, response=response, items=list(cached.items))
         response.raise_for_status()
+
+        body_hash = hashlib.blake2b(response.content, digest_size=16).digest()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if cached is not None and cached.body_hash == body_hash:
+            cached.etag, cached.last_modified = etag, last_modified
+            self._pages.move_to_end(url)
+            return Page(url=url, response=response, items=list(cached.items))
+
+        if self.archive is not None:
+            try:
+                await asyncio.to_thread(self.archive.append, url, tag, response.content, response.encoding)
+            except Exception as e:
+                self.archive.failed += 1
+                self.archive.last_error = f"{url}: {e}"
+
+        if self.page_cache_size > 0:
+            self._pages[url] = CachedPage(etag=etag, last_modified=last_modified, body_hash=body_hash)
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.page_cache_size:
+                self._pages.popitem(last=False)
+        return Page(url=url, response=response)
+
+    def store_items(self, url: str, tag: str, items: List[ParsedItem]) -> None:
+        """记录页面的解析结果，供下次 fetch_page 复用"""
+        cached = self._pages.get(url)
+        if cached is not None:
+            cached.tag = tag
+            cached.items = list(items)
+
+    async def get(self, url: str, **kwargs) -> Selector:
+        response = await self.fetch(url, **kwargs)
         return Selector(text=response.text)
 
-    async def get_batch(
-        self, urls: List[str], concurrency: Optional[int] = None
-    ) -> List[Selector]:
-        concurrency = concurrency or settings.max_concurrency
-        semaphore = asyncio.Semaphore(concurrency)
+    async def fetch_batch(
+        self,
+        urls: List[str],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[httpx.Response]:
+        """并发抓取多个页面，返回原始响应，不在事件循环上解析
+
+        return_exceptions 为 True 时失败的页面以异常对象占位，不影响其他页面。
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.max_concurrency)
 
-        async def fetch_with_limit(url: str) -> Selector:
+        async def fetch_with_limit(url: str) -> httpx.Response:
             async with semaphore:
-                return await self.get(url)
+                return await self.fetch(url)
 
-        selectors = await asyncio.gather(*[fetch_with_limit(url) for url in urls])
-        return selectors
+        return await asyncio.gather(
+            *[fetch_with_limit(url) for url in urls], return_exceptions=return_exceptions
+        )
 
     async def post(self, url: str, **kwargs) -> Selector:
         response = await self.client.post(url, **kwargs)
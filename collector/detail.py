@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+import httpx
+from config import settings
+from .client import CollectorClient
+from .executor import ParseExecutor
+from .protocol import ParsedItem
+from .sqlite import SQLiteStore
+
+
+class DetailStore(SQLiteStore):
+    """详情页标题的持久化缓存
+
+    以 URL 为键记录 parse_detail 得到的标题，ttl 内同一文章页只抓取一次。
+    标题为空的结果同样记录，避免反复抓取解析不出标题的页面。
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or settings.detail_cache_path
+        self.ttl = ttl or settings.detail_cache_ttl
+        super().__init__(
+            self.path,
+            "CREATE TABLE IF NOT EXISTS detail (url TEXT PRIMARY KEY, title TEXT NOT NULL, fetched_at REAL NOT NULL)",
+        )
+
+    def get_many(self, urls: List[str], max_age: Optional[float] = None) -> Dict[str, str]:
+        """返回已缓存的 URL 到标题的映射
+
+        Args:
+            urls: 文章页 URL
+            max_age: 只返回这么多秒内缓存的标题，默认 ttl
+        """
+        since = time.time() - (self.ttl if max_age is None else max_age)
+        found: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT url, title FROM detail WHERE fetched_at >= ? AND url IN ({placeholders})",
+                    [since, *chunk],
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, titles: Dict[str, str]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO detail (url, title, fetched_at) VALUES (?, ?, ?)",
+                [(url, title, now) for url, title in titles.items()],
+            )
+            self._conn.execute("DELETE FROM detail WHERE fetched_at < ?", (now - self.ttl,))
+
+def detail_urls(items: List[ParsedItem], limit: int) -> List[str]:
+    """需要补全标题的前 limit 个 URL（去重）"""
+    return list(dict.fromkeys(item.url for item in items if not item.title and item.url))[:limit]
+
+
+def apply_titles(items: List[ParsedItem], titles: Dict[str, str]) -> List[ParsedItem]:
+    """用 URL 到标题的映射补全标题为空的条目，其余条目原样返回"""
+    return [
+        ParsedItem(title=titles[item.url], url=item.url, source=item.source)
+        if not item.title and titles.get(item.url)
+        else item
+        for item in items
+    ]
+
+
+async def enrich_details(
+    client: CollectorClient,
+    source: str,
+    items: List[ParsedItem],
+    store: DetailStore,
+    limit: int,
+    executor: Optional[ParseExecutor] = None,
+    concurrency: Optional[int] = None,
+) -> List[ParsedItem]:
+    """为标题为空的条目抓取详情页补全标题
+
+    只处理前 limit 个需要补全的 URL，已缓存的直接使用，其余通过
+    CollectorClient.fetch_batch 并发抓取后交给 executor 用数据源解析器的 parse_detail 解析。
+    抓取或解析失败的页面不缓存、标题保持为空，下次采集时重试，不影响其他条目。
+
+    Args:
+        client: 采集客户端
+        source: 数据源标识
+        items: 列表页解析结果
+        store: 详情页标题缓存
+        limit: 单个数据源最多补全的条目数
+        executor: HTML 解析执行器，默认在当前线程解析
+        concurrency: 详情页并发抓取数，默认 settings.detail_concurrency
+
+    Returns:
+        补全标题后的条目，未能补全的条目标题仍为空
+    """
+    urls = detail_urls(items, limit)
+    if not urls:
+        return items
+
+    titles = await asyncio.to_thread(store.get_many, urls)
+    missing = [url for url in urls if url not in titles]
+    if missing:
+        executor = executor or ParseExecutor(mode="inline")
+        responses = await client.fetch_batch(
+            missing, concurrency or settings.detail_concurrency, return_exceptions=True
+        )
+        pages = [(url, response) for url, response in zip(missing, responses) if isinstance(response, httpx.Response)]
+        parsed = await asyncio.gather(
+            *[executor.parse_detail(source, response.content, response.encoding) for _, response in pages],
+            return_exceptions=True,
+        )
+        fetched = {
+            url: title
+            for (url, _), title in zip(pages, parsed)
+            if isinstance(title, str)
+        }
+        if fetched:
+            await asyncio.to_thread(store.put_many, fetched)
+        titles.update(fetched)
+
+    return apply_titles(items, titles)
@@ -0,0 +1,150 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List, Optional
+from config import settings
+from .client import CollectorClient
+from .detail import DetailStore, enrich_details
+from .executor import ParseExecutor
+from .parser import SOURCES
+from .protocol import ParsedItem
+from .store import ItemStore
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+
+
+@dataclass
+class SourceResult:
+    source: str
+    items: List[ParsedItem] = field(default_factory=list)
+    error: Optional[str] = None
+    unchanged: bool = False
+    from_cache: bool = False
+    age: float = 0.0
+
+
+_INLINE = ParseExecutor(mode="inline")
+
+
+async def collect_source(
+    client: CollectorClient,
+    source: str,
+    executor: Optional[ParseExecutor] = None,
+    details: Optional[DetailStore] = None,
+    store: Optional[ItemStore] = None,
+) -> SourceResult:
+    """采集单个数据源，错误写入结果而不是抛出
+
+    Args:
+        client: 采集客户端
+        source: 数据源标识
+        executor: HTML 解析执行器，默认在当前线程解析
+        details: 详情页标题缓存，为空时不抓取详情页补全标题
+        store: 采集结果存储，为空时不保存
+    """
+    source_config = SOURCES.get(source)
+    if source_config is None:
+        return SourceResult(source=source, error=f"Source config not found: {source}")
+
+    parser = source_config["parser"]()
+    executor = executor or _INLINE
+
+    home_url = source_config["home_url"]
+
+    try:
+        page = await client.fetch_page(home_url, tag=source)
+        if page.unchanged:
+            parsed_items = page.items
+        else:
+            parsed_items = await executor.parse(source, page.response.content, page.response.encoding)
+            client.store_items(home_url, source, parsed_items)
+        if details is not None and source_config.get("detail_limit"):
+            parsed_items = await enrich_details(
+                client, source, parsed_items, details, source_config["detail_limit"], executor
+            )
+    except Exception as e:
+        return SourceResult(source=source, error=f"Fetch error {source}: {str(e)}")
+
+    if not parsed_items:
+        return SourceResult(source=source, error=f"No items found from {source}")
+
+    items = [item for item in parsed_items if parser.validate(item)]
+    if store is not None:
+        try:
+            await asyncio.to_thread(store.add, items)
+        except Exception as e:
+            return SourceResult(source=source, items=items, error=f"Store error {source}: {str(e)}")
+    return SourceResult(source=source, items=items, unchanged=page.unchanged)
+
+
+async def collect_sources(
+    client: CollectorClient,
+    sources: List[str],
+    concurrency: Optional[int] = None,
+    executor: Optional[ParseExecutor] = None,
+    cache: Optional["ResultCache"] = None,
+    details: Optional[DetailStore] = None,
+    store: Optional[ItemStore] = None,
+) -> List[SourceResult]:
+    """并发采集多个数据源，结果顺序与 sources 一致
+
+    Args:
+        client: 采集客户端
+        sources: 数据源标识列表
+        concurrency: 同时进行的采集数上限，默认 settings.max_concurrency
+        executor: HTML 解析执行器，默认在当前线程解析
+        cache: 结果缓存，为空时每次都重新采集
+        details: 详情页标题缓存，为空时不抓取详情页补全标题
+        store: 采集结果存储，为空时不保存
+
+    Returns:
+        每个数据源的采集结果
+    """
+    collect_with_limit = _limited(client, concurrency, executor, cache, details, store)
+    return await asyncio.gather(*[collect_with_limit(source) for source in sources])
+
+
+async def iter_sources(
+    client: CollectorClient,
+    sources: List[str],
+    concurrency: Optional[int] = None,
+    executor: Optional[ParseExecutor] = None,
+    cache: Optional["ResultCache"] = None,
+    details: Optional[DetailStore] = None,
+    store: Optional[ItemStore] = None,
+) -> AsyncIterator[SourceResult]:
+    """并发采集多个数据源，按完成先后逐个产出结果
+
+    迭代提前结束时，尚未完成的采集任务会被取消。
+    """
+    collect_with_limit = _limited(client, concurrency, executor, cache, details, store)
+    tasks = [asyncio.create_task(collect_with_limit(source)) for source in sources]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _limited(
+    client: CollectorClient,
+    concurrency: Optional[int],
+    executor: Optional[ParseExecutor],
+    cache: Optional["ResultCache"] = None,
+    details: Optional[DetailStore] = None,
+    store: Optional[ItemStore] = None,
+) -> Callable[[str], Awaitable[SourceResult]]:
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.max_concurrency))
+
+    async def collect_with_limit(source: str) -> SourceResult:
+        async with semaphore:
+            return await collect_source(client, source, executor, details, store)
+
+    if cache is None:
+        return collect_with_limit
+
+    async def collect_cached(source: str) -> SourceResult:
+        return await cache.get_or_fetch(source, lambda: collect_with_limit(source))
+
+    return collect_cached
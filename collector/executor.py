@@ -0,0 +1,67 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+from parsel import Selector
+from config import settings
+from .parser import SOURCES
+from .protocol import ParsedItem
+
+
+def parse_source(source: str, body: bytes, encoding: Optional[str] = None) -> List[ParsedItem]:
+    """解析数据源首页的原始字节，返回解析出的全部条目（未校验）
+
+    为模块级函数，可以直接提交到进程池执行。
+    """
+    parser = SOURCES[source]["parser"]()
+    text = body.decode(encoding or "utf-8", errors="replace")
+    return parser.parse_list(Selector(text=text))
+
+
+def parse_detail_title(source: str, body: bytes, encoding: Optional[str] = None) -> str:
+    """解析数据源详情页的原始字节，返回标题，解析不出时为空字符串"""
+    parser = SOURCES[source]["parser"]()
+    text = body.decode(encoding or "utf-8", errors="replace")
+    return parser.parse_detail(Selector(text=text)).title
+
+
+class ParseExecutor:
+    """HTML 解析执行器
+
+    mode 为 process 时在进程池中解析，CPU 密集的 XPath 计算可利用多核且不阻塞事件循环；
+    thread 时在线程池中解析；inline 时直接在当前线程解析。
+    """
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None):
+        self.mode = mode or settings.parse_executor
+        # 多个 uvicorn worker 时每个进程只分到一部分 CPU
+        self.workers = workers or settings.parse_workers or max(1, (os.cpu_count() or 1) // max(1, settings.workers))
+        self._pool: Optional[Executor] = None
+
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        elif self.mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        elif self.mode != "inline":
+            raise ValueError(f"Unknown parse executor: {self.mode}")
+
+    async def parse(self, source: str, body: bytes, encoding: Optional[str] = None) -> List[ParsedItem]:
+        if self._pool is None:
+            return parse_source(source, body, encoding)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, parse_source, source, body, encoding)
+
+    async def parse_detail(self, source: str, body: bytes, encoding: Optional[str] = None) -> str:
+        if self._pool is None:
+            return parse_detail_title(source, body, encoding)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, parse_detail_title, source, body, encoding)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
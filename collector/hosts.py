@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from config import settings
+
+
+class CircuitOpenError(Exception):
+    """主机熔断期间的请求直接失败"""
+
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {host}, retry in {retry_after:.1f}s")
+
+
+class HostController:
+    """单个主机的并发控制与熔断
+
+    并发上限按 AIMD 调整：请求成功且延迟不超过 latency_target 时每次增加 1/limit，
+    出错或延迟过高时减半。连续失败 failure_threshold 次后熔断，cooldown 秒内的请求
+    直接抛出 CircuitOpenError；冷却结束后放行一个探测请求，成功则恢复，失败则继续熔断。
+
+    每次熔断递增 generation，acquire 返回当前 generation；熔断前发出、熔断后才结束的请求
+    带着旧的 generation 归还，其结果不会改变熔断状态。
+
+    单次请求的超时由 timeout() 给出：有延迟记录时取 latency * timeout_factor，
+    并随连续失败次数减半，最低 timeout_min 秒、最高 settings.timeout，
+    卡住的主机不会在熔断前每次都耗满全局超时。
+    """
+
+    def __init__(
+        self,
+        host: str,
+        initial: Optional[int] = None,
+        maximum: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+        timeout_factor: Optional[float] = None,
+        timeout_min: Optional[float] = None,
+    ):
+        self.host = host
+        self.maximum = maximum or settings.host_max_concurrency
+        self.limit = float(min(initial or settings.host_initial_concurrency, self.maximum))
+        self.latency_target = latency_target or settings.host_latency_target
+        self.failure_threshold = failure_threshold or settings.breaker_failure_threshold
+        self.cooldown = cooldown or settings.breaker_cooldown
+        self.timeout_factor = timeout_factor or settings.host_timeout_factor
+        self.timeout_min = timeout_min or settings.host_timeout_min
+
+        self.state = "closed"
+        self.inflight = 0
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.generation = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> int:
+        """等待并发名额，熔断中直接抛出 CircuitOpenError
+
+        Returns:
+            当前的熔断 generation，归还名额时传回 release
+        """
+        self._raise_if_open()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.inflight < max(1, int(self.limit)))
+            self._raise_if_open()
+            if self.state == "open":
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probing:
+                    raise CircuitOpenError(self.host, 0.0)
+                self._probing = True
+            self.inflight += 1
+            return self.generation
+
+    async def release(self, ok: Optional[bool], latency: float = 0.0, generation: Optional[int] = None) -> None:
+        """归还名额并记录结果
+
+        Args:
+            ok: 请求是否成功，None 表示请求被取消、不计入统计
+            latency: 请求耗时（秒）
+            generation: acquire 返回的 generation，与当前不同时结果不计入统计
+        """
+        async with self._cond:
+            self.inflight -= 1
+            if generation is not None and generation != self.generation:
+                # 熔断前发出的请求，不能据此关闭或再次触发熔断
+                ok = None
+            elif self.state == "half_open":
+                self._probing = False
+            if ok is True:
+                self._on_success(latency)
+            elif ok is False:
+                self._on_failure()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "timeout": round(self.timeout(), 1),
+            "retry_after": round(max(0.0, self._open_until - time.monotonic()), 1) if self.state == "open" else 0.0,
+        }
+
+    def timeout(self) -> float:
+        """本主机下一次请求的超时（秒）"""
+        base = settings.timeout
+        if self.latency is not None:
+            base = min(base, max(self.timeout_min, self.latency * self.timeout_factor))
+        return max(self.timeout_min, base / (2 ** self.consecutive_failures))
+
+    def _raise_if_open(self) -> None:
+        if self.state == "open":
+            remaining = self._open_until - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.host, remaining)
+
+    def _on_success(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.consecutive_failures = 0
+        if self.state == "half_open":
+            self.state = "closed"
+        if latency > self.latency_target:
+            self.limit = max(1.0, self.limit / 2)
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+
+    def _on_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.limit = max(1.0, self.limit / 2)
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self._open_until = time.monotonic() + self.cooldown
+            self.trips += 1
+            self.generation += 1
+
+
+class HostPool:
+    """按主机名管理 HostController"""
+
+    def __init__(self, **config: Any):
+        self.config = config
+        self._hosts: Dict[str, HostController] = {}
+
+    def get(self, url: str) -> HostController:
+        host = urlsplit(url).hostname or url
+        controller = self._hosts.get(host)
+        if controller is None:
+            controller = self._hosts[host] = HostController(host, **self.config)
+        return controller
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: controller.stats() for host, controller in sorted(self._hosts.items())}
+
+    def any_open(self) -> bool:
+        return any(controller.state != "closed" for controller in self._hosts.values())
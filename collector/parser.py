@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from lxml import etree
 from parsel import Selector
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .protocol import ParsedItem
 
 
@@ -19,38 +20,56 @@ class BaseParser(ABC):
         return bool(item.title and item.url)
 
 
+def _anchor_title(a) -> Optional[str]:
+    """与 text() 优先、string(.) 兜底的写法等价
+
+    text() 的第一个结果是 a 的第一个直接文本节点，可能是 a.text，
+    也可能是某个子节点之后的 tail；都没有时取全部文本。
+    """
+    if a.text:
+        return a.text
+    for child in a:
+        if child.tail:
+            return child.tail
+    return "".join(a.itertext())
+
+
+def _first_text(selector: Selector, *expressions: etree.XPath) -> str:
+    for expression in expressions:
+        result = expression(selector.root)
+        if result:
+            return result[0]
+    return ""
+
+
 class SinaParser(BaseParser):
     source_name: str = "sina"
 
+    # 先定位 ul 再检查祖先，避免 //div//ul 在嵌套 div 上重复展开后代
+    _hot_list = etree.XPath('//ul[contains(@class, "uni-blk-list") and contains(@class, "list-a")][ancestor::div[contains(@class, "blk_card")]]/li/a')
+    _headlines = etree.XPath('//div[@id="blk_yw_01"]//h1[contains(@data-client, "headline")]/a')
+    _detail_title = etree.XPath('//h1//text()', smart_strings=False)
+    _page_title = etree.XPath('//title/text()', smart_strings=False)
+
     def parse_list(self, selector: Selector) -> List[ParsedItem]:
         items = []
+        root = selector.root
 
-        hot_list = selector.xpath('//div[contains(@class, "blk_card")]//ul[contains(@class, "uni-blk-list") and contains(@class, "list-a")]/li/a')
-        for a in hot_list[:10]:
-            href = a.xpath('@href').get()
-            title = a.xpath('text()').get() or a.xpath('string(.)').get()
-            if href and title and href.startswith("http"):
-                items.append(ParsedItem(
-                    title=title.strip(),
-                    url=href,
-                    source="sina"
-                ))
-
-        yaowen_headlines = selector.xpath('//div[@id="blk_yw_01"]//h1[contains(@data-client, "headline")]/a')
-        for a in yaowen_headlines[:5]:
-            href = a.xpath('@href').get()
-            title = a.xpath('text()').get() or a.xpath('string(.)').get()
-            if href and title and href.startswith("http"):
-                items.append(ParsedItem(
-                    title=title.strip(),
-                    url=href,
-                    source="sina"
-                ))
+        for anchors, limit in ((self._hot_list(root), 10), (self._headlines(root), 5)):
+            for a in anchors[:limit]:
+                href = a.get("href")
+                title = _anchor_title(a)
+                if href and title and href.startswith("http"):
+                    items.append(ParsedItem(
+                        title=title.strip(),
+                        url=href,
+                        source="sina"
+                    ))
 
         return items
 
     def parse_detail(self, selector: Selector) -> ParsedItem:
-        title = selector.xpath('//h1//text()').get("") or selector.xpath('//title/text()').get("")
+        title = _first_text(selector, self._detail_title, self._page_title)
         return ParsedItem(
             title=title.strip() if title else "",
             url="",
@@ -61,45 +80,34 @@ class SinaParser(BaseParser):
 class NeteaseParser(BaseParser):
     source_name: str = "163"
 
-    def parse_list(self, selector: Selector) -> List[ParsedItem]:
-        items = []
+    _containers = etree.XPath('//div[contains(@class, "news_df_yw")]')
+    _fallback_containers = etree.XPath('//div[@class="ns_area"]')
+    _container_links = etree.XPath('.//a[@href]')
+    _links = etree.XPath('//a[@href]')
+    _detail_title = etree.XPath('//h1[@class="headline"]/text()', smart_strings=False)
+    _any_h1 = etree.XPath('//h1/text()', smart_strings=False)
 
-        containers = selector.xpath('//div[contains(@class, "news_df_yw")]')
-        if not containers:
-            containers = selector.xpath('//div[@class="ns_area"]')
+    def parse_list(self, selector: Selector) -> List[ParsedItem]:
+        root = selector.root
+        containers = self._containers(root) or self._fallback_containers(root)
 
+        items = []
         for container in containers:
-            all_links = container.xpath('.//a[@href]')
-            for a in all_links:
-                href = a.xpath('@href').get()
-                title = a.xpath('string(.)').get()
+            for a in self._container_links(container):
+                href, title = a.get("href"), "".join(a.itertext()).strip()
                 if href and title and href.startswith("http"):
-                    title = title.strip()
-                    if title:
-                        items.append(ParsedItem(
-                            title=title,
-                            url=href,
-                            source="163"
-                        ))
+                    items.append(ParsedItem(title=title, url=href, source="163"))
 
         if not items:
-            all_links = selector.xpath('//a[@href]')
-            for a in all_links:
-                href = a.xpath('@href').get()
-                title = a.xpath('string(.)').get()
-                if href and title and href.startswith("http"):
-                    title = title.strip()
-                    if title and len(title) > 5 and "163.com" in href:
-                        items.append(ParsedItem(
-                            title=title,
-                            url=href,
-                            source="163"
-                        ))
+            for a in self._links(root):
+                href, title = a.get("href"), "".join(a.itertext()).strip()
+                if href and href.startswith("http") and len(title) > 5 and "163.com" in href:
+                    items.append(ParsedItem(title=title, url=href, source="163"))
 
         return items
 
     def parse_detail(self, selector: Selector) -> ParsedItem:
-        title = selector.xpath('//h1[@class="headline"]/text()').get("") or selector.xpath('//h1/text()').get("")
+        title = _first_text(selector, self._detail_title, self._any_h1)
         return ParsedItem(
             title=title.strip() if title else "",
             url="",
@@ -110,16 +118,19 @@ class NeteaseParser(BaseParser):
 class TencentParser(BaseParser):
     source_name: str = "tencent"
 
+    _list_urls = etree.XPath('//div[@class="list"]//a[@href]/@href', smart_strings=False)
+    _detail_title = etree.XPath('//h1[@class="article-title"]/text()', smart_strings=False)
+    _any_h1 = etree.XPath('//h1/text()', smart_strings=False)
+
     def parse_list(self, selector: Selector) -> List[ParsedItem]:
-        news_list = selector.xpath('//div[@class="list"]//a[@href]/@href').getall()
-        items = []
-        for url in news_list:
-            if url.startswith("http"):
-                items.append(ParsedItem(title="", url=url, source="tencent"))
-        return items
+        return [
+            ParsedItem(title="", url=url, source="tencent")
+            for url in self._list_urls(selector.root)
+            if url.startswith("http")
+        ]
 
     def parse_detail(self, selector: Selector) -> ParsedItem:
-        title = selector.xpath('//h1[@class="article-title"]/text()').get("") or selector.xpath('//h1/text()').get("")
+        title = _first_text(selector, self._detail_title, self._any_h1)
         return ParsedItem(
             title=title.strip() if title else "",
             url="",
@@ -130,16 +141,19 @@ class TencentParser(BaseParser):
 class ArticleParser(BaseParser):
     source_name: str = "article"
 
+    _list_urls = etree.XPath("//a[@href]/@href", smart_strings=False)
+    _detail_title = etree.XPath("//h1//text()", smart_strings=False)
+    _page_title = etree.XPath("//title/text()", smart_strings=False)
+
     def parse_list(self, selector: Selector) -> List[ParsedItem]:
-        urls = selector.xpath("//a[@href]/@href").getall()
-        items = []
-        for url in urls:
-            if url.startswith("http"):
-                items.append(ParsedItem(title="", url=url, source="article"))
-        return items
+        return [
+            ParsedItem(title="", url=url, source="article")
+            for url in self._list_urls(selector.root)
+            if url.startswith("http")
+        ]
 
     def parse_detail(self, selector: Selector) -> ParsedItem:
-        title = selector.xpath("//h1//text()").get("") or selector.xpath("//title/text()").get("")
+        title = _first_text(selector, self._detail_title, self._page_title)
         return ParsedItem(
             title=title.strip() if title else "",
             url="",
@@ -167,6 +181,7 @@ SOURCES: Dict[str, Dict[str, Any]] = {
     "tencent": {
         "parser": TencentParser,
         "home_url": "https://news.qq.com/",
+        "detail_limit": 20,
     },
 }
 
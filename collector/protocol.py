@@ -1,13 +1,50 @@
-from dataclasses import dataclass
 from typing import Dict, Any, Optional
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节，安装了 orjson 时使用 orjson
+
+    obj 中可以直接包含 ParsedItem，编码时逐个转换，不需要事先构造整批字典。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ParsedItem):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
-@dataclass
 class ParsedItem:
-    title: str
-    url: str
-    source: Optional[str] = None
+    """解析结果条目
+
+    使用 __slots__ 而非 dataclass，每个实例不带 __dict__，大批量条目的内存占用更小。
+    """
+
+    __slots__ = ("title", "url", "source")
+
+    def __init__(self, title: str, url: str, source: Optional[str] = None):
+        self.title = title
+        self.url = url
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"ParsedItem(title={self.title!r}, url={self.url!r}, source={self.source!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.title, self.url, self.source) == (other.title, other.url, other.source)
+
+    __hash__ = None
 
     def to_dict(self) -> Dict[str, Any]:
         result = {
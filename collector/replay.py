@@ -0,0 +1,190 @@
+"""
+归档快照回放
+在不访问网络的情况下，用当前的解析器重新解析一段时间内归档的页面，
+用于改版后的解析器回归检查与历史数据回填。
+需要详情页补全标题的数据源（配置了 detail_limit）只从详情页标题缓存补全，不抓取详情页。
+
+用法：python -m collector.replay [--source sina] [--since 2026-10-01] [--until 2026-10-08] [--store] [--items]
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from config import settings
+from .archive import Snapshot, SnapshotArchive
+from .detail import DetailStore, apply_titles, detail_urls
+from .executor import ParseExecutor
+from .parser import SOURCES
+from .protocol import ParsedItem, dumps
+from .store import ItemStore
+
+
+@dataclass
+class ReplayResult:
+    source: str
+    url: str
+    fetched_at: float
+    items: List[ParsedItem] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+async def replay_snapshot(
+    archive: SnapshotArchive,
+    snapshot: Snapshot,
+    executor: ParseExecutor,
+    details: Optional[DetailStore] = None,
+) -> ReplayResult:
+    """解析一份快照，错误写入结果而不是抛出
+
+    配置了 detail_limit 的数据源用 details 中缓存的详情页标题补全（不论缓存时长），
+    缓存中没有的条目标题为空、不计入结果；未提供 details 时直接报错。
+    """
+    result = ReplayResult(source=snapshot.tag, url=snapshot.url, fetched_at=snapshot.fetched_at)
+    source_config = SOURCES.get(snapshot.tag)
+    if source_config is None:
+        result.error = f"Source config not found: {snapshot.tag}"
+        return result
+
+    detail_limit = source_config.get("detail_limit")
+    if detail_limit and details is None:
+        result.error = f"Source {snapshot.tag} needs cached detail titles, no detail store given"
+        return result
+
+    parser = source_config["parser"]()
+    missing = 0
+    try:
+        body = await asyncio.to_thread(archive.read, snapshot)
+        parsed_items = await executor.parse(snapshot.tag, body, snapshot.encoding)
+        if detail_limit:
+            urls = detail_urls(parsed_items, detail_limit)
+            titles = await asyncio.to_thread(details.get_many, urls, math.inf)
+            parsed_items = apply_titles(parsed_items, titles)
+            missing = len(urls) - len(titles)
+    except Exception as e:
+        result.error = f"Replay error {snapshot.tag}: {str(e)}"
+        return result
+
+    result.items = [item for item in parsed_items if parser.validate(item)]
+    if not result.items:
+        result.error = f"No items found from {snapshot.tag}"
+        if missing:
+            result.error += f" ({missing} titles not in detail cache)"
+    return result
+
+
+async def replay(
+    archive: SnapshotArchive,
+    sources: Optional[List[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    executor: Optional[ParseExecutor] = None,
+    store: Optional[ItemStore] = None,
+    details: Optional[DetailStore] = None,
+) -> AsyncIterator[ReplayResult]:
+    """按抓取时间顺序回放时间范围内的快照
+
+    每次并发解析 executor.workers 份快照，按原顺序产出，
+    写入 store 时数据的 first_seen 为快照的抓取时间。
+
+    Args:
+        archive: 快照归档
+        sources: 只回放这些数据源，为空时回放全部
+        start: 起始时间戳（含）
+        end: 结束时间戳（不含）
+        executor: HTML 解析执行器，默认在当前线程解析
+        store: 采集结果存储，为空时不保存
+        details: 详情页标题缓存，用于补全配置了 detail_limit 的数据源
+    """
+    executor = executor or ParseExecutor(mode="inline")
+    snapshots = await asyncio.to_thread(archive.snapshots, sources, start, end)
+    batch = max(1, executor.workers) if executor.mode != "inline" else 1
+    for index in range(0, len(snapshots), batch):
+        chunk = snapshots[index:index + batch]
+        parsed = await asyncio.gather(
+            *[replay_snapshot(archive, snapshot, executor, details) for snapshot in chunk]
+        )
+        for result in parsed:
+            # 按抓取时间顺序写入，回填数据的 id 与原始采集顺序一致
+            if store is not None and result.items and result.error is None:
+                try:
+                    await asyncio.to_thread(store.add, result.items, result.fetched_at)
+                except Exception as e:
+                    result.error = f"Store error {result.source}: {str(e)}"
+            yield result
+
+
+def _timestamp(value: str) -> float:
+    """解析时间参数，接受 Unix 时间戳或 ISO 8601 日期时间（本地时区）"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    archive = SnapshotArchive(args.archive)
+    executor = ParseExecutor(mode=args.executor)
+    store = ItemStore(args.store_path) if args.store else None
+    details = DetailStore(args.details_path)
+    total_items = 0
+    errors = []
+    snapshots = 0
+    try:
+        results = replay(
+            archive,
+            args.source,
+            _timestamp(args.since) if args.since else None,
+            _timestamp(args.until) if args.until else None,
+            executor,
+            store,
+            details,
+        )
+        async for result in results:
+            snapshots += 1
+            total_items += len(result.items)
+            if result.error:
+                errors.append(result.error)
+            line = {
+                "source": result.source,
+                "url": result.url,
+                "fetched_at": result.fetched_at,
+                "count": len(result.items),
+                "error": result.error,
+            }
+            if args.items:
+                line["items"] = [item.to_dict() for item in result.items]
+            sys.stdout.buffer.write(dumps(line) + b"\n")
+        sys.stdout.buffer.write(dumps({
+            "done": True,
+            "snapshots": snapshots,
+            "total_items": total_items,
+            "errors": errors if errors else None,
+        }) + b"\n")
+    finally:
+        executor.shutdown()
+        archive.close()
+        details.close()
+        if store is not None:
+            store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NewsFlow snapshot replay")
+    parser.add_argument("--archive", default=settings.archive_path, help="归档目录")
+    parser.add_argument("--source", action="append", help="只回放这些数据源，可重复传入")
+    parser.add_argument("--since", help="起始时间（含），Unix 时间戳或 ISO 8601")
+    parser.add_argument("--until", help="结束时间（不含），Unix 时间戳或 ISO 8601")
+    parser.add_argument("--executor", default="inline", choices=["inline", "thread", "process"], help="解析执行器")
+    parser.add_argument("--store", action="store_true", help="把解析结果写入采集结果存储")
+    parser.add_argument("--store-path", default=settings.item_store_path, help="采集结果存储路径")
+    parser.add_argument("--items", action="store_true", help="输出每份快照解析出的条目")
+    parser.add_argument("--details-path", default=settings.detail_cache_path, help="详情页标题缓存路径")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
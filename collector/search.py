@@ -0,0 +1,42 @@
+import re
+from typing import List
+
+# 中日韩文字按字切分，其余按字母数字连续串切分
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_RUNS = re.compile(f"[{_CJK}]+|[0-9a-z]+")
+_CJK_RUN = re.compile(f"[{_CJK}]")
+
+
+def tokenize(text: str) -> List[str]:
+    """索引用分词：中日韩文字连续串切成二元组并追加末字，字母数字串整体作为一个词
+
+    末字单独成词，单字查询才能命中位于串尾的字。
+
+    Example:
+        tokenize("国产AI芯片")  # ["国产", "产", "ai", "芯片", "片"]
+    """
+    tokens: List[str] = []
+    for run in _RUNS.findall(text.lower()):
+        if _CJK_RUN.match(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def match_query(query: str) -> str:
+    """把用户查询转换为 FTS5 MATCH 表达式，各词之间为 AND
+
+    中日韩文字串只取二元组；单个汉字用前缀匹配，可以命中以该字开头的二元组和末字。
+    无可用词时返回空字符串。
+    """
+    terms: List[str] = []
+    for run in _RUNS.findall(query.lower()):
+        if _CJK_RUN.match(run) and len(run) == 1:
+            terms.append(f'"{run}"*')
+        elif _CJK_RUN.match(run):
+            terms.extend(f'"{run[i:i + 2]}"' for i in range(len(run) - 1))
+        else:
+            terms.append(f'"{run}"')
+    return " AND ".join(dict.fromkeys(terms))
@@ -0,0 +1,42 @@
+import bisect
+import hashlib
+from typing import Dict, List, Optional
+
+
+def _point(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """一致性哈希环
+
+    每个节点在环上放置 vnodes 个虚拟点，数据源映射到顺时针方向的第一个点所属的节点。
+    增加或移除一个节点时，只有落在该节点区间内的数据源会改变归属。
+
+    Example:
+        ring = HashRing(["http://10.0.0.1:23119", "http://10.0.0.2:23119"])
+        ring.node_for("sina")
+    """
+
+    def __init__(self, nodes: List[str], vnodes: int = 64):
+        self.nodes = list(dict.fromkeys(nodes))
+        self.vnodes = vnodes
+        ring = sorted((_point(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """返回负责该键的节点，环为空时返回 None"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _point(key)) % len(self._points)
+        return self._owners[index]
+
+    def assign(self, keys: List[str]) -> Dict[str, List[str]]:
+        """按节点分组，保持 keys 的原有顺序"""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            node = self.node_for(key)
+            if node is not None:
+                groups.setdefault(node, []).append(key)
+        return groups
@@ -0,0 +1,31 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SQLiteStore:
+    """本地 SQLite 存储的公共基类
+
+    统一各存储的连接方式：按需创建所在目录，一个跨线程共用的连接（调用方经 asyncio.to_thread 访问），
+    WAL 日志与 synchronous=NORMAL，行以 sqlite3.Row 返回。所有读写都应持有 self._lock。
+
+    Example:
+        class SeenStore(SQLiteStore):
+            def __init__(self, path: str):
+                super().__init__(path, "CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY)")
+    """
+
+    def __init__(self, path: str, schema: str = ""):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if schema:
+            self._conn.executescript(schema)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
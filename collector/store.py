@@ -0,0 +1,190 @@
+import hashlib
+import time
+from typing import Any, Dict, List, Optional
+from config import settings
+from .protocol import ParsedItem
+from .search import match_query, tokenize
+from .sqlite import SQLiteStore
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url_hash BLOB NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_source ON items (source, id);
+CREATE INDEX IF NOT EXISTS idx_items_first_seen ON items (first_seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(tokens, tokenize='unicode61 remove_diacritics 0');
+"""
+
+
+class ItemStore(SQLiteStore):
+    """采集结果的本地存储
+
+    每条数据以 URL 摘要去重，首次出现时分配自增 id，id 即增量读取的游标：
+    GET /collect/items?since=<id> 只需从主键（或 source, id 索引）定位后顺序读取一页，
+    与总行数无关。再次出现的数据只更新 last_seen，不会改变 id。
+    first_seen 早于 retention 秒的数据会被清理。
+
+    标题按 search.tokenize 分词后写入 FTS5 倒排索引（rowid 与 id 相同），与数据在同一事务内写入。
+    FTS5 以追加的段（segment）组织索引并在写入时自动合并，索引常驻磁盘，内存占用与数据量无关。
+    """
+
+    def __init__(self, path: Optional[str] = None, retention: Optional[float] = None):
+        self.path = path or settings.item_store_path
+        self.retention = retention or settings.item_store_retention
+        self.prefix_candidates = settings.search_prefix_candidates
+        super().__init__(self.path, _SCHEMA)
+        self._backfill_index()
+
+    def add(self, items: List[ParsedItem], seen_at: Optional[float] = None) -> int:
+        """写入一批数据
+
+        Args:
+            items: 解析结果
+            seen_at: 记为 first_seen / last_seen 的时间，默认当前时间；回放归档快照时为抓取时间
+
+        Returns:
+            首次出现的数据条数
+        """
+        if not items:
+            return 0
+        now = time.time()
+        seen = seen_at or now
+        with self._lock, self._conn:
+            # 写事务内新插入的 id 都大于 last_id，其他进程的写入会等待本事务结束
+            self._conn.execute("BEGIN IMMEDIATE")
+            last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM items").fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (url_hash, source, title, url, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(_url_hash(item.url), item.source, item.title, item.url, seen, seen) for item in items],
+            )
+            inserted = self._index_after(last_id)
+            self._conn.executemany(
+                "UPDATE items SET last_seen = MAX(last_seen, ?) WHERE url_hash = ?",
+                [(seen, _url_hash(item.url)) for item in items],
+            )
+            cutoff = now - self.retention
+            self._conn.execute(
+                "DELETE FROM items_fts WHERE rowid IN (SELECT id FROM items WHERE first_seen < ?)", (cutoff,)
+            )
+            self._conn.execute("DELETE FROM items WHERE first_seen < ?", (cutoff,))
+        return inserted
+
+    def since(
+        self,
+        cursor: int = 0,
+        sources: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """读取游标之后首次出现的数据
+
+        Args:
+            cursor: 上一页返回的 next_cursor，0 表示从头读取
+            sources: 只读取这些数据源，为空时读取全部
+            limit: 每页条数
+
+        Returns:
+            {"items": [...], "next_cursor": 下一页游标, "has_more": 是否还有数据}
+        """
+        query = "SELECT id, source, title, url, first_seen FROM items WHERE id > ?"
+        params: List[Any] = [cursor]
+        if sources:
+            query += f" AND source IN ({','.join('?' for _ in sources)})"
+            params.extend(sources)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "items": [dict(row) for row in rows],
+            "next_cursor": rows[-1]["id"] if rows else cursor,
+            "has_more": has_more,
+        }
+
+    def search(
+        self,
+        query: str,
+        sources: Optional[List[str]] = None,
+        days: Optional[float] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """按标题全文检索，结果按 BM25 相关度排序，相关度相同时较新的在前
+
+        含单字查询时只在最新的 search_prefix_candidates 条命中中排序。
+
+        Args:
+            query: 查询词，空格分隔的多个词须同时命中
+            sources: 只检索这些数据源
+            days: 只检索最近若干天首次出现的数据
+            limit: 返回条数
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+
+        where = ""
+        filters: List[Any] = []
+        if sources:
+            where += f" AND items.source IN ({','.join('?' for _ in sources)})"
+            filters.extend(sources)
+        if days:
+            where += " AND items.first_seen >= ?"
+            filters.append(time.time() - days * 86400)
+
+        sql = (
+            "SELECT items.id, items.source, items.title, items.url, items.first_seen, "
+            "bm25(items_fts) AS score FROM items_fts JOIN items ON items.id = items_fts.rowid "
+            "WHERE items_fts MATCH ?" + where
+        )
+        params: List[Any] = [expression, *filters]
+        if "*" in expression:
+            # 单字前缀匹配要合并以该字开头的所有词的倒排表，命中行数多时很慢；
+            # 只在最新的 search_prefix_candidates 条命中中排序，以 rowid 下界交给 FTS5 跳过更早的数据
+            sql += (
+                " AND items_fts.rowid >= (SELECT MIN(rowid) FROM ("
+                "SELECT items_fts.rowid FROM items_fts JOIN items ON items.id = items_fts.rowid "
+                "WHERE items_fts MATCH ?" + where + " ORDER BY items_fts.rowid DESC LIMIT ?))"
+            )
+            params.extend([expression, *filters, self.prefix_candidates])
+        sql += " ORDER BY score, items.id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{**dict(row), "score": round(-row["score"], 4)} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, last = self._conn.execute("SELECT COUNT(*), MAX(id) FROM items").fetchone()
+        return {"items": count, "last_cursor": last or 0}
+
+    def _index_after(self, last_id: int) -> int:
+        """为 id 大于 last_id 的数据建立全文索引，返回索引的条数"""
+        rows = self._conn.execute("SELECT id, title FROM items WHERE id > ?", (last_id,)).fetchall()
+        self._conn.executemany(
+            "INSERT INTO items_fts (rowid, tokens) VALUES (?, ?)",
+            [(row["id"], " ".join(tokenize(row["title"]))) for row in rows],
+        )
+        return len(rows)
+
+    def _backfill_index(self) -> None:
+        """为建立全文索引之前写入的数据补建索引"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            indexed = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM items_fts").fetchone()[0]
+            self._index_after(indexed)
+
+
+def _url_hash(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
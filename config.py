@@ -1,17 +1,79 @@
+import os
+
+
 class Settings:
     collector_host: str = "0.0.0.0"
     collector_port: int = 23119
     pusher_host: str = "0.0.0.0"
     pusher_port: int = 23120
+    scheduler_host: str = "0.0.0.0"
+    scheduler_port: int = 23121
     timeout: float = 30.0
     max_concurrency: int = 10
+    pool_max_connections: int = 100
+    pool_max_keepalive: int = 20
+    pool_keepalive_expiry: float = 30.0
+    parse_executor: str = "process"
+    parse_workers: int = 0
+    workers: int = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    shard_nodes: list = []
+    shard_self: str = ""
+    shard_vnodes: int = 64
+    page_cache_size: int = 256
+    detail_enrich: bool = True
+    detail_concurrency: int = 5
+    detail_cache_path: str = "data/details.db"
+    detail_cache_ttl: float = 7 * 86400.0
+    host_initial_concurrency: int = 4
+    host_max_concurrency: int = 10
+    host_latency_target: float = 3.0
+    host_timeout_factor: float = 4.0
+    host_timeout_min: float = 5.0
+    breaker_failure_threshold: int = 3
+    breaker_cooldown: float = 60.0
+    item_store_enabled: bool = True
+    item_store_path: str = "data/items.db"
+    item_store_retention: float = 30 * 86400.0
+    items_page_size: int = 100
+    search_prefix_candidates: int = 2000
+    archive_enabled: bool = False
+    archive_path: str = "data/archive"
+    archive_codec: str = "gzip"
+    archive_segment_size: int = 64 * 1024 * 1024
+    archive_segment_age: float = 86400.0
+    archive_retention: float = 30 * 86400.0
+    archive_prune_interval: float = 3600.0
+    result_cache_ttl: float = 30.0
+    result_cache_max_items: int = 5000
+    push_timeout: float = 10.0
+    push_concurrency: int = 5
+    push_target_timeout: float = 60.0
+    push_queue_size: int = 100
+    push_queue_consumers: int = 2
+    outbox_path: str = "data/outbox.db"
+    outbox_max_attempts: int = 6
+    outbox_base_delay: float = 5.0
+    outbox_max_delay: float = 600.0
+    outbox_lease: float = 300.0
+    outbox_poll_interval: float = 2.0
+    outbox_retention: float = 86400.0
+    dedup_path: str = "data/seen.db"
+    dedup_ttl: float = 7 * 86400.0
+    dedup_capacity: int = 200000
+    dedup_error_rate: float = 0.01
     service_token: str = ""
     default_role: str = "collector"
 
+    # 定时任务：sources 采集 → processors 处理 → targets 推送，interval 秒运行一次
+    # processors 为注册名或 {"name": 注册名, **参数}，jitter 默认 interval * schedule_jitter
+    schedule_jitter: float = 0.1
+    schedule_jobs: dict = {}
+
     push_targets: dict = {
         "wechat_main": {
             "type": "wechat",
             "webhook_url": "https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key=48839e8e-6a87-42ee-9d7a-b55bd181a52b",
+            "rate_limit": {"per_minute": 20, "burst": 1},
         }
     }
 
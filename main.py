@@ -1,8 +1,11 @@
 import uvicorn
 import argparse
+import os
 import sys
 from services.collector import app as collector_app
+from services.combined import app as combined_app
 from services.pusher import app as pusher_app
+from services.scheduler import app as scheduler_app
 from config import settings
 
 
@@ -11,14 +14,24 @@ def parse_args():
         description="NewsFlow - News Collection & Push Service",
         epilog="Services:\n"
                "  collector  - News collection service (port 23119)\n"
-               "  pusher     - Message push service (port 23120)"
+               "  pusher     - Message push service (port 23120)\n"
+               "  scheduler  - In-process collect/process/push jobs (port 23121)\n"
+               "  all        - Collector and pusher in one process (port 23119)"
     )
     parser.add_argument(
         "--role",
         type=str,
-        choices=["collector", "pusher"],
+        choices=["collector", "pusher", "scheduler", "all"],
         default=settings.default_role,
-        help="Service role: collector (port 23119) or pusher (port 23120)",
+        help="Service role: collector (port 23119), pusher (port 23120), scheduler (port 23121) "
+             "or all (collector and pusher on port 23119)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of collector worker processes, each with its own client pool (collector role only; "
+             "defaults to WEB_CONCURRENCY for the collector role and 1 otherwise)",
     )
     return parser.parse_args()
 
@@ -28,12 +41,43 @@ def main():
     role = args.role
     print(f"[Config] 使用角色: {role}")
 
+    if args.workers is not None and args.workers > 1 and role != "collector":
+        sys.exit("[Config] --workers 仅支持 collector 角色")
     if role == "collector":
+        args.workers = args.workers or settings.workers
+    else:
+        # WEB_CONCURRENCY 只对 collector 角色生效，其他角色始终单进程运行
+        args.workers = 1
+    settings.workers = args.workers
+
+    if role == "collector" and args.workers > 1:
+        # 子进程重新导入 config，通过环境变量得知 worker 数量
+        os.environ["WEB_CONCURRENCY"] = str(args.workers)
+        print(f"[Config] worker 数量: {args.workers}")
+        uvicorn.run(
+            "services.collector:app",
+            host=settings.collector_host,
+            port=settings.collector_port,
+            workers=args.workers,
+        )
+    elif role == "collector":
         uvicorn.run(
             collector_app,
             host=settings.collector_host,
             port=settings.collector_port,
         )
+    elif role == "all":
+        uvicorn.run(
+            combined_app,
+            host=settings.collector_host,
+            port=settings.collector_port,
+        )
+    elif role == "scheduler":
+        uvicorn.run(
+            scheduler_app,
+            host=settings.scheduler_host,
+            port=settings.scheduler_port,
+        )
     else:
         uvicorn.run(
             pusher_app,
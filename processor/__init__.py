@@ -0,0 +1,26 @@
+from .base import BaseProcessor
+from .dedup import DedupProcessor
+from .filter import AhoCorasick, FilterProcessor
+from .formatter import format_item, format_batch, pack_batch
+from .processor import DataProcessor
+from .registry import ProcessorRegistry
+from .similarity import NearDedupProcessor
+
+
+ProcessorRegistry.register("dedup", DedupProcessor)
+ProcessorRegistry.register("near_dedup", NearDedupProcessor)
+ProcessorRegistry.register("filter", FilterProcessor)
+
+
+__all__ = [
+    "AhoCorasick",
+    "BaseProcessor",
+    "DataProcessor",
+    "DedupProcessor",
+    "FilterProcessor",
+    "NearDedupProcessor",
+    "ProcessorRegistry",
+    "format_item",
+    "format_batch",
+    "pack_batch",
+]
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
 
 class BaseProcessor(ABC):
     """数据处理器抽象基类"""
     processor_type: str = "base"
+    stream_batch_size: Optional[int] = None
 
     @abstractmethod
     async def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -14,3 +15,21 @@ class BaseProcessor(ABC):
     def validate_config(self) -> bool:
         """验证配置是否有效"""
         pass
+
+    async def process_stream(self, items: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """流式处理数据
+
+        默认实现为列表处理器的适配器：每凑满 stream_batch_size 条调用一次 process，
+        stream_batch_size 为 None 时等上游结束后对全部数据调用一次。
+        逐条独立处理的处理器可覆盖此方法实现真正的逐条输出。
+        """
+        batch: List[Dict[str, Any]] = []
+        async for item in items:
+            batch.append(item)
+            if self.stream_batch_size and len(batch) >= self.stream_batch_size:
+                for result in await self.process(batch):
+                    yield result
+                batch = []
+        if batch:
+            for result in await self.process(batch):
+                yield result
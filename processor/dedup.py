@@ -0,0 +1,223 @@
+from typing import List, Dict, Any, Iterable, Optional
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collector.sqlite import SQLiteStore
+from config import settings
+from .base import BaseProcessor
+
+
+def url_hash(url: str) -> bytes:
+    """URL 的 16 字节摘要，用作布隆过滤器与磁盘索引的键"""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """定长位数组布隆过滤器
+
+    按期望容量与误判率计算位数和哈希次数，内存占用固定。
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+
+class RotatingBloomFilter:
+    """按时间轮换的双代布隆过滤器
+
+    每经过 ttl 秒，当前代降为上一代，旧的上一代被丢弃；查询同时检查两代，
+    因此 ttl 内加入的键不会漏判，内存占用始终为两个定长过滤器。
+    """
+
+    def __init__(self, capacity: int, error_rate: float, ttl: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+
+    def add(self, key: bytes) -> None:
+        self._maybe_rotate()
+        self._current.add(key)
+
+    def __contains__(self, key: bytes) -> bool:
+        self._maybe_rotate()
+        return key in self._current or key in self._previous
+
+    def _maybe_rotate(self) -> None:
+        if time.monotonic() - self._rotated_at >= self.ttl:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = time.monotonic()
+
+
+_SEEN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY, seen_at REAL NOT NULL) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_seen_at ON seen (seen_at);
+"""
+
+
+class SeenStore(SQLiteStore):
+    """已见 URL 的持久化索引
+
+    布隆过滤器挡在 SQLite 前面：过滤器判定未见过的键直接视为新数据，
+    只有可能见过的键才查询磁盘，磁盘记录按 ttl 过期。
+
+    shared 为 True 时同一文件被多个进程共用，进程内的布隆过滤器看不到其他进程写入的键，
+    此时每个键都查询磁盘，并在同一个写事务内完成查询与写入。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        capacity: int,
+        error_rate: float = 0.01,
+        shared: bool = False,
+    ):
+        self.path = path
+        self.ttl = ttl
+        super().__init__(path, _SEEN_SCHEMA)
+        self.shared = shared
+        self._bloom = RotatingBloomFilter(capacity, error_rate, ttl)
+        self._warm_up()
+
+    def filter_new(self, keys: List[bytes]) -> List[bool]:
+        """判断每个键是否为新键，并把新键记为已见
+
+        Args:
+            keys: URL 摘要列表
+
+        Returns:
+            与 keys 一一对应，新键为 True
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            if self.shared:
+                self._conn.execute("BEGIN IMMEDIATE")
+                maybe_seen = set(keys)
+            else:
+                maybe_seen = {key for key in keys if key in self._bloom}
+            if maybe_seen:
+                seen = self._lookup(maybe_seen, now - self.ttl)
+            else:
+                seen = set()
+
+            result = []
+            new_keys = []
+            for key in keys:
+                is_new = key not in seen
+                result.append(is_new)
+                if is_new:
+                    seen.add(key)
+                    new_keys.append(key)
+                    self._bloom.add(key)
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)",
+                [(key, now) for key in new_keys],
+            )
+            self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (now - self.ttl,))
+        return result
+
+    def _lookup(self, keys: set, since: float) -> set:
+        found = set()
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = self._conn.execute(
+                f"SELECT key FROM seen WHERE seen_at >= ? AND key IN ({placeholders})",
+                [since, *chunk],
+            ).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def _warm_up(self) -> None:
+        rows = self._conn.execute(
+            "SELECT key FROM seen WHERE seen_at >= ?", (time.time() - self.ttl,)
+        )
+        for (key,) in rows:
+            self._bloom.add(key)
+
+
+class DedupProcessor(BaseProcessor):
+    """跨批次 URL 去重处理器
+
+    记录已处理过的 URL，ttl 内再次出现的数据会被过滤，同一批次内的重复也会去除。
+    没有 url 字段的数据原样保留。
+
+    Example:
+        processor = DataProcessor()
+        processor.add_processor(DedupProcessor(ttl=86400))
+    """
+
+    processor_type: str = "dedup"
+    stream_batch_size: Optional[int] = 20
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+    ):
+        self.path = path or settings.dedup_path
+        self.ttl = ttl or settings.dedup_ttl
+        self.capacity = capacity or settings.dedup_capacity
+        self.error_rate = error_rate or settings.dedup_error_rate
+        self._store: Optional[SeenStore] = None
+        self._store_lock = threading.Lock()
+
+    async def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """过滤 ttl 内已出现过的数据"""
+        urls = [item["url"] for item in data if item.get("url")]
+        if not urls:
+            return data
+
+        is_new = iter(await self.filter_new_urls(urls))
+        return [item for item in data if not item.get("url") or next(is_new)]
+
+    async def filter_new_urls(self, urls: List[str]) -> List[bool]:
+        """判断每个 URL 是否为 ttl 内首次出现，并记录为已出现
+
+        同一批中重复的 URL 只有第一个为 True。
+        """
+        if not urls:
+            return []
+        return await asyncio.to_thread(self._filter_new, [url_hash(url) for url in urls])
+
+    def validate_config(self) -> bool:
+        return bool(self.path) and self.ttl > 0 and self.capacity > 0 and 0 < self.error_rate < 1
+
+    def close(self) -> None:
+        with self._store_lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def _filter_new(self, keys: List[bytes]) -> List[bool]:
+        with self._store_lock:
+            if self._store is None:
+                self._store = SeenStore(
+                    self.path, self.ttl, self.capacity, self.error_rate, shared=settings.workers > 1
+                )
+            store = self._store
+        return store.filter_new(keys)
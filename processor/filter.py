@@ -0,0 +1,134 @@
+from collections import deque
+from typing import List, Dict, Any, AsyncIterator, Optional, Set
+from .base import BaseProcessor
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机
+
+    关键词在构造时编译一次，之后每段文本只需扫描一遍即可找出全部命中的关键词，
+    与关键词数量无关。匹配不区分大小写。
+
+    Example:
+        automaton = AhoCorasick(["AI", "芯片"])
+        automaton.find("国产AI芯片发布")  # {"AI", "芯片"}
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = [k for k in dict.fromkeys(keywords) if k]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword.lower():
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """返回文本中出现的全部关键词"""
+        goto, fail, output = self._goto, self._fail, self._output
+        matched: Set[int] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matched.update(output[state])
+        return {self.keywords[index] for index in matched}
+
+
+class FilterProcessor(BaseProcessor):
+    """关键词筛选与主题标记处理器
+
+    包含、排除和主题关键词编译进同一个自动机，每条数据的标题只扫描一遍：
+    - keywords：非空时只保留命中任一关键词的数据
+    - exclude：命中任一关键词的数据被丢弃
+    - topics：主题到关键词的映射，命中的主题写入数据的 topics 字段
+
+    保留的数据会附带 matched_keywords 字段，便于下游按关键词或主题路由推送。
+
+    Example:
+        processor = DataProcessor()
+        processor.add_processor(FilterProcessor(
+            keywords=["AI", "芯片"],
+            exclude=["广告"],
+            topics={"tech": ["AI", "芯片"], "finance": ["A股"]},
+        ))
+    """
+
+    processor_type: str = "filter"
+
+    def __init__(
+        self,
+        keywords: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        topics: Optional[Dict[str, List[str]]] = None,
+        field: str = "title",
+    ):
+        self.keywords = list(keywords or [])
+        self.exclude = list(exclude or [])
+        self.topics = dict(topics or {})
+        self.field = field
+
+        self._include_set = set(self.keywords)
+        self._exclude_set = set(self.exclude)
+        self._topic_index: Dict[str, List[str]] = {}
+        for topic, topic_keywords in self.topics.items():
+            for keyword in topic_keywords:
+                self._topic_index.setdefault(keyword, []).append(topic)
+
+        self._automaton = AhoCorasick(self.keywords + self.exclude + list(self._topic_index))
+
+    async def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """筛选数据并标记命中的关键词和主题"""
+        result = []
+        for item in data:
+            tagged = self._match(item)
+            if tagged is not None:
+                result.append(tagged)
+        return result
+
+    async def process_stream(self, items: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """逐条筛选，命中即输出"""
+        async for item in items:
+            tagged = self._match(item)
+            if tagged is not None:
+                yield tagged
+
+    def validate_config(self) -> bool:
+        return bool(self.keywords or self.exclude or self.topics)
+
+    def _match(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """返回带标记的数据，应被丢弃时返回 None"""
+        found = self._automaton.find(item.get(self.field) or "")
+        if found & self._exclude_set:
+            return None
+        matched = found & self._include_set
+        if self._include_set and not matched:
+            return None
+
+        tagged = {**item, "matched_keywords": sorted(matched)}
+        if self.topics:
+            tagged["topics"] = sorted({t for k in found for t in self._topic_index.get(k, ())})
+        return tagged
@@ -1,4 +1,4 @@
-from typing import Dict, List, Callable, Literal
+from typing import Dict, List, Callable, Literal, Tuple
 
 FormatType = Literal["markdown", "text", "plain"]
 
@@ -61,3 +61,48 @@ def format_batch(items: List[Dict], format_type: FormatType = "markdown") -> Lis
         格式化后的字符串列表
     """
     return [format_item(item, format_type) for item in items]
+
+
+def pack_batch(
+    items: List[Dict],
+    format_type: FormatType = "markdown",
+    max_bytes: int = 4096,
+    separator: str = "\n\n",
+) -> List[Tuple[str, int]]:
+    """将多条数据按顺序合并为尽量少的消息，每条消息不超过 max_bytes
+
+    按 UTF-8 字节数计算长度，依次贪心装入当前消息，放不下时另起一条；
+    单条数据本身超过上限时按字节截断。
+
+    Args:
+        items: 数据字典列表
+        format_type: 格式化类型，支持 markdown、text、plain
+        max_bytes: 单条消息的最大字节数
+        separator: 同一消息内各条数据之间的分隔符
+
+    Returns:
+        (消息内容, 包含的数据条数) 列表
+    """
+    sep_size = len(separator.encode("utf-8"))
+    messages: List[Tuple[str, int]] = []
+    parts: List[str] = []
+    size = 0
+
+    for text in format_batch(items, format_type):
+        encoded = text.encode("utf-8")
+        if len(encoded) > max_bytes:
+            text = encoded[:max_bytes].decode("utf-8", errors="ignore")
+            encoded = text.encode("utf-8")
+
+        added = len(encoded) + (sep_size if parts else 0)
+        if parts and size + added > max_bytes:
+            messages.append((separator.join(parts), len(parts)))
+            parts, size = [], 0
+            added = len(encoded)
+
+        parts.append(text)
+        size += added
+
+    if parts:
+        messages.append((separator.join(parts), len(parts)))
+    return messages
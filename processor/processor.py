@@ -1,6 +1,46 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterable, AsyncIterator, Iterable, Optional, Union
+import asyncio
 from .base import BaseProcessor
-from .formatter import format_batch, FormatType
+from .formatter import format_batch, format_item, FormatType
+from .registry import ProcessorRegistry
+
+
+_END = object()
+
+
+class _StageError:
+    """上游阶段的异常，沿队列传递给下游"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def _iter_source(data: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+    if hasattr(data, "__aiter__"):
+        async for item in data:
+            yield item
+    else:
+        for item in data:
+            yield item
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+    while True:
+        item = await queue.get()
+        if item is _END:
+            return
+        if isinstance(item, _StageError):
+            raise item.error
+        yield item
+
+
+async def _pump(items: AsyncIterator[Dict[str, Any]], queue: asyncio.Queue) -> None:
+    try:
+        async for item in items:
+            await queue.put(item)
+    except Exception as e:
+        await queue.put(_StageError(e))
+    await queue.put(_END)
 
 
 class DataProcessor:
@@ -16,6 +56,10 @@ class DataProcessor:
         processor.add_processor(DedupProcessor())
         processor.add_processor(FilterProcessor(keywords=["AI"]))
         result = await processor.run(items, format_type="markdown")
+
+        # 流式模式：各处理器并发运行，结果就绪即输出
+        async for text in processor.stream(items):
+            ...
     """
 
     def __init__(self):
@@ -34,6 +78,24 @@ class DataProcessor:
         self._processors.append(processor)
         return self
 
+    def add_processor_by_name(self, name: str, **config: Any) -> "DataProcessor":
+        """按注册名创建处理器并添加到处理链
+
+        Args:
+            name: ProcessorRegistry 中的处理器标识符
+            **config: 传给处理器构造函数的参数
+
+        Returns:
+            self，支持链式调用
+
+        Raises:
+            ValueError: 未注册的处理器
+        """
+        processor_cls = ProcessorRegistry.get(name)
+        if processor_cls is None:
+            raise ValueError(f"Unknown processor: {name}")
+        return self.add_processor(processor_cls(**config))
+
     def set_format(self, format_type: FormatType) -> "DataProcessor":
         """设置输出格式
 
@@ -76,6 +138,56 @@ class DataProcessor:
             current_data = await processor.process(current_data)
         return current_data
 
+    async def stream(
+        self,
+        data: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        queue_size: int = 100,
+    ) -> AsyncIterator[str]:
+        """流式执行处理链，逐条产出格式化后的字符串
+
+        Args:
+            data: 原始数据，可以是普通可迭代对象或异步迭代器
+            queue_size: 阶段间队列容量，下游处理不过来时上游会等待
+
+        Yields:
+            格式化后的字符串
+        """
+        async for item in self.stream_with_raw_output(data, queue_size):
+            yield format_item(item, self._format_type)
+
+    async def stream_with_raw_output(
+        self,
+        data: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        queue_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """流式执行处理链，逐条产出处理后的原始数据
+
+        每个处理器作为独立任务运行，通过有界队列相连，
+        各阶段并发处理，队列满时上游阻塞形成背压。
+
+        Args:
+            data: 原始数据，可以是普通可迭代对象或异步迭代器
+            queue_size: 阶段间队列容量
+
+        Yields:
+            处理后的数据
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        tasks = [asyncio.create_task(_pump(_iter_source(data), queue))]
+
+        for processor in self._processors:
+            next_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+            tasks.append(asyncio.create_task(_pump(processor.process_stream(_drain(queue)), next_queue)))
+            queue = next_queue
+
+        try:
+            async for item in _drain(queue):
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     @property
     def processor_count(self) -> int:
         """当前已添加的处理器数量"""
@@ -84,3 +196,10 @@ class DataProcessor:
     def clear_processors(self) -> None:
         """清空所有处理器"""
         self._processors.clear()
+
+    def close(self) -> None:
+        """释放处理器持有的资源（如去重处理器的磁盘索引）"""
+        for processor in self._processors:
+            close = getattr(processor, "close", None)
+            if close is not None:
+                close()
@@ -1,4 +1,4 @@
-from typing import Dict, Type
+from typing import Dict, List, Type
 from .base import BaseProcessor
 
 
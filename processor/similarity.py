@@ -0,0 +1,132 @@
+from array import array
+from typing import List, Dict, Any, AsyncIterator, Set, Tuple
+import hashlib
+import random
+import re
+from .base import BaseProcessor
+
+
+_PRIME = 4294967291
+_NOISE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def shingles(text: str, ngram: int = 2) -> Set[str]:
+    """字符 n-gram 集合，去除空白与标点，适用于不分词的中文标题"""
+    text = _NOISE.sub("", text.lower())
+    if len(text) <= ngram:
+        return {text} if text else set()
+    return {text[i:i + ngram] for i in range(len(text) - ngram + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash 签名生成器
+
+    使用固定种子生成 num_perm 组 (a*x + b) mod p 哈希，签名在进程间保持一致。
+    每个 n-gram 的哈希向量会被缓存，标题中的 n-gram 高度重复，
+    签名计算基本只剩逐位取最小值。
+    """
+
+    def __init__(self, num_perm: int, seed: int = 1, cache_size: int = 50000):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.cache_size = cache_size
+        self._perms = [(rng.randint(1, _PRIME - 1), rng.randint(0, _PRIME - 1)) for _ in range(num_perm)]
+        self._cache: Dict[str, array] = {}
+
+    def signature(self, features: Set[str]) -> Tuple[int, ...]:
+        if not features:
+            return (_PRIME,) * self.num_perm
+        return tuple(map(min, zip(*map(self._vector, features))))
+
+    def _vector(self, feature: str) -> array:
+        vector = self._cache.get(feature)
+        if vector is None:
+            h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest(), "little")
+            vector = array("I", [(a * h + b) % _PRIME for a, b in self._perms])
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[feature] = vector
+        return vector
+
+
+class NearDedupProcessor(BaseProcessor):
+    """标题近似去重处理器
+
+    对标题做字符 n-gram 的 MinHash 签名，按 LSH 分段分桶，只与同桶的已保留数据
+    比较 Jaccard 相似度，达到阈值即视为同一新闻，每组只保留最先出现的一条。
+    整体开销随数据量近似线性增长。
+
+    Example:
+        processor = DataProcessor()
+        processor.add_processor(NearDedupProcessor(threshold=0.6))
+    """
+
+    processor_type: str = "near_dedup"
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        ngram: int = 2,
+        bands: int = 10,
+        rows: int = 3,
+        field: str = "title",
+    ):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+        self.field = field
+        self._hasher = MinHasher(bands * rows)
+
+    async def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """去除近似重复的数据，保持原有顺序"""
+        index = _ClusterIndex(self)
+        return [item for item in data if index.add(item)]
+
+    async def process_stream(self, items: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """逐条判断，与此前已输出的数据都不相似即输出"""
+        index = _ClusterIndex(self)
+        async for item in items:
+            if index.add(item):
+                yield item
+
+    def validate_config(self) -> bool:
+        return 0 < self.threshold <= 1 and self.ngram > 0 and self.bands > 0 and self.rows > 0
+
+
+class _ClusterIndex:
+    """单次处理内的 LSH 分桶索引，只收录每组的代表数据"""
+
+    def __init__(self, config: NearDedupProcessor):
+        self.config = config
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._features: List[Set[str]] = []
+
+    def add(self, item: Dict[str, Any]) -> bool:
+        """数据与已收录的代表都不相似时收录并返回 True"""
+        config = self.config
+        features = shingles(item.get(config.field) or "", config.ngram)
+        if not features:
+            return True
+
+        signature = config._hasher.signature(features)
+        keys = [
+            (band, signature[band * config.rows:(band + 1) * config.rows])
+            for band in range(config.bands)
+        ]
+
+        candidates = {index for key in keys for index in self._buckets.get(key, ())}
+        if any(jaccard(features, self._features[index]) >= config.threshold for index in candidates):
+            return False
+
+        index = len(self._features)
+        self._features.append(features)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return True
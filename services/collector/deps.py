@@ -1,16 +1,112 @@
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from collector.archive import SnapshotArchive
+from collector.cache import ResultCache
 from collector.client import CollectorClient
-from collector.parser import SOURCES, BaseParser
-from typing import AsyncGenerator
+from collector.detail import DetailStore
+from collector.executor import ParseExecutor
+from collector.sharding import HashRing
+from collector.store import ItemStore
+from processor.dedup import DedupProcessor
+from config import settings
+from services.pusher.handoff import PushQueue
+from typing import AsyncIterator, Optional
+import httpx
 
 
-async def get_collector_client() -> AsyncGenerator[CollectorClient, None]:
-    async with CollectorClient() as client:
-        yield client
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """应用生命周期内共享一个带连接池的采集客户端"""
+    # 先校验分片配置，配置错误时不创建其他资源
+    app.state.shard_ring = _build_shard_ring()
+    app.state.dedup_processor = DedupProcessor()
+    app.state.parse_executor = ParseExecutor()
+    app.state.result_cache = ResultCache()
+    app.state.detail_store = DetailStore() if settings.detail_enrich else None
+    app.state.item_store = ItemStore() if settings.item_store_enabled else None
+    app.state.snapshot_archive = SnapshotArchive() if settings.archive_enabled else None
+    async with CollectorClient(archive=app.state.snapshot_archive) as client, httpx.AsyncClient(timeout=settings.timeout + 5) as shard_client:
+        app.state.collector_client = client
+        app.state.shard_client = shard_client
+        prune_task = None
+        if app.state.snapshot_archive is not None:
+            prune_task = asyncio.create_task(_prune_archive(app.state.snapshot_archive))
+        try:
+            yield
+        finally:
+            if prune_task is not None:
+                prune_task.cancel()
+                try:
+                    await prune_task
+                except asyncio.CancelledError:
+                    pass
+            app.state.parse_executor.shutdown()
+            app.state.dedup_processor.close()
+            if app.state.detail_store is not None:
+                app.state.detail_store.close()
+            if app.state.item_store is not None:
+                app.state.item_store.close()
+            if app.state.snapshot_archive is not None:
+                app.state.snapshot_archive.close()
 
 
-def get_parser(name: str) -> BaseParser:
-    source_config = SOURCES.get(name)
-    if source_config is None:
-        raise ValueError(f"Unknown source: {name}")
-    parser_class = source_config["parser"]
-    return parser_class()
+async def _prune_archive(archive: SnapshotArchive) -> None:
+    """定期清理过期的归档段，没有新页面归档（不换段）时保留期也照常生效"""
+    while True:
+        try:
+            await asyncio.to_thread(archive.prune)
+        except Exception as e:
+            archive.last_error = f"prune: {e}"
+        await asyncio.sleep(settings.archive_prune_interval)
+
+
+def _build_shard_ring() -> Optional[HashRing]:
+    """按配置构建一致性哈希环，shard_self 不在 shard_nodes 中时启动失败，避免节点静默地不采集任何数据源"""
+    if not settings.shard_nodes:
+        return None
+    if settings.shard_self and settings.shard_self not in settings.shard_nodes:
+        raise ValueError(f"shard_self {settings.shard_self!r} is not one of shard_nodes {settings.shard_nodes!r}")
+    return HashRing(settings.shard_nodes, settings.shard_vnodes)
+
+
+def get_collector_client(request: Request) -> CollectorClient:
+    return request.app.state.collector_client
+
+
+def get_shard_ring(request: Request) -> Optional[HashRing]:
+    return request.app.state.shard_ring
+
+
+def get_shard_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.shard_client
+
+
+def get_parse_executor(request: Request) -> ParseExecutor:
+    return request.app.state.parse_executor
+
+
+def get_result_cache(request: Request) -> ResultCache:
+    return request.app.state.result_cache
+
+
+def get_detail_store(request: Request) -> Optional[DetailStore]:
+    return request.app.state.detail_store
+
+
+def get_item_store(request: Request) -> Optional[ItemStore]:
+    return request.app.state.item_store
+
+
+def get_snapshot_archive(request: Request) -> Optional[SnapshotArchive]:
+    return request.app.state.snapshot_archive
+
+
+def get_push_queue(request: Request) -> Optional[PushQueue]:
+    """进程内推送队列，仅在 --role all 时存在"""
+    return getattr(request.app.state, "push_queue", None)
+
+
+def get_dedup_processor(request: Request) -> DedupProcessor:
+    return request.app.state.dedup_processor
+
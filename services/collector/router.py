@@ -1,8 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+import asyncio
+import httpx
+from collector.archive import SnapshotArchive
+from collector.cache import ResultCache
 from collector.client import CollectorClient
-from collector.parser import SOURCES, SOURCES_KEYS
-from .schemas import CollectRequest, CollectResponse
-from .deps import get_collector_client, get_parser
+from collector.detail import DetailStore
+from collector.engine import SourceResult, collect_sources, iter_sources
+from collector.executor import ParseExecutor
+from collector.parser import SOURCES_KEYS
+from collector.protocol import ParsedItem, dumps
+from collector.sharding import HashRing
+from collector.store import ItemStore
+from config import settings
+from processor.dedup import DedupProcessor
+from services.pusher.handoff import PushQueue
+from .schemas import CollectRequest, CollectResponse, ItemsResponse, SearchResponse
+from .deps import (
+    get_collector_client,
+    get_dedup_processor,
+    get_detail_store,
+    get_item_store,
+    get_parse_executor,
+    get_push_queue,
+    get_result_cache,
+    get_shard_client,
+    get_shard_ring,
+    get_snapshot_archive,
+)
 
 
 router = APIRouter(prefix="/collect", tags=["collector"])
@@ -12,61 +38,303 @@ def get_all_available_sources() -> list:
     return SOURCES_KEYS
 
 
+def get_owned_sources(ring: Optional[HashRing]) -> list:
+    """分片模式下本节点负责的数据源，未启用分片时为全部数据源"""
+    if ring is None or not settings.shard_self:
+        return get_all_available_sources()
+    return ring.assign(get_all_available_sources()).get(settings.shard_self, [])
+
+
+def resolve_sources(sources: List[str], ring: Optional[HashRing] = None) -> List[str]:
+    """把 "all" 或空列表展开为本节点负责的数据源，其余原样返回"""
+    if "all" in sources or not sources:
+        return get_owned_sources(ring)
+    return sources
+
+
+def _resolve_sources(request: CollectRequest, ring: Optional[HashRing] = None) -> List[str]:
+    return resolve_sources(request.sources, ring)
+
+
+def _resolve_push_targets(push_to: Optional[str], push_queue: Optional[PushQueue]) -> List[str]:
+    if not push_to:
+        return []
+    if push_queue is None:
+        raise HTTPException(
+            status_code=400,
+            detail="push_to requires the collector and pusher in one process (--role all)",
+        )
+    targets = [target.strip() for target in push_to.split(",") if target.strip()]
+    unknown = [target for target in targets if target not in settings.push_targets]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown target: {', '.join(unknown)}")
+    return targets
+
+
+def _request_cache(request: CollectRequest, cache: ResultCache) -> Optional[ResultCache]:
+    return cache if request.use_cache else None
+
+
+async def _result_items(
+    result: SourceResult,
+    request: CollectRequest,
+    dedup: DedupProcessor,
+) -> List[ParsedItem]:
+    """返回 ParsedItem 列表，由 dumps 在编码时逐个转换，不预先构造整批字典"""
+    if not request.only_new:
+        return result.items
+    is_new = await dedup.filter_new_urls([item.url for item in result.items])
+    return [item for item, new in zip(result.items, is_new) if new]
+
+
 @router.get("/sources")
-async def list_sources():
-    return {"sources": SOURCES_KEYS}
+async def list_sources(ring: Optional[HashRing] = Depends(get_shard_ring)):
+    if ring is None:
+        return {"sources": SOURCES_KEYS}
+    return {"sources": SOURCES_KEYS, "owned": get_owned_sources(ring), "shards": ring.assign(SOURCES_KEYS)}
 
 
 @router.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+async def health_check(
+    client: CollectorClient = Depends(get_collector_client),
+    push_queue: Optional[PushQueue] = Depends(get_push_queue),
+    ring: Optional[HashRing] = Depends(get_shard_ring),
+    archive: Optional[SnapshotArchive] = Depends(get_snapshot_archive),
+):
+    """服务状态与各主机的并发上限、熔断状态
+
+    --role all 时附带进程内推送队列状态，启用快照归档时附带归档状态，
+    分片模式下附带本节点地址与负责的数据源。
+    """
+    health = {
+        "status": "degraded" if client.hosts.any_open() else "healthy",
+        "hosts": client.hosts.stats(),
+    }
+    if push_queue is not None:
+        health["push_queue"] = push_queue.stats()
+    if ring is not None:
+        health["shard"] = {"self": settings.shard_self, "owned": get_owned_sources(ring)}
+    if archive is not None:
+        health["archive"] = await asyncio.to_thread(archive.stats)
+    return health
+
+
+@router.get("/cache")
+async def cache_stats(cache: ResultCache = Depends(get_result_cache)):
+    return cache.stats()
+
+
+@router.delete("/cache")
+async def clear_cache(cache: ResultCache = Depends(get_result_cache)):
+    cache.clear()
+    return cache.stats()
+
+
+@router.get("/items", response_model=ItemsResponse)
+async def list_items(
+    since: int = Query(0, ge=0, description="上一页返回的 next_cursor，0 表示从头读取"),
+    source: Optional[List[str]] = Query(None, description="只返回这些数据源，可重复传入"),
+    limit: int = Query(settings.items_page_size, ge=1, le=1000),
+    store: Optional[ItemStore] = Depends(get_item_store),
+):
+    """按游标增量读取已采集的数据，只返回游标之后首次出现的数据"""
+    if store is None:
+        raise HTTPException(status_code=404, detail="Item store is disabled (item_store_enabled)")
+    page = await asyncio.to_thread(store.since, since, source, limit)
+    return Response(content=dumps(page), media_type="application/json")
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_items(
+    q: str = Query(..., min_length=1, description="查询词，空格分隔的多个词须同时命中"),
+    source: Optional[List[str]] = Query(None, description="只检索这些数据源，可重复传入"),
+    days: Optional[float] = Query(None, gt=0, description="只检索最近若干天首次出现的数据"),
+    limit: int = Query(20, ge=1, le=100),
+    store: Optional[ItemStore] = Depends(get_item_store),
+):
+    """按标题全文检索已采集的数据，结果按相关度排序"""
+    if store is None:
+        raise HTTPException(status_code=404, detail="Item store is disabled (item_store_enabled)")
+    items = await asyncio.to_thread(store.search, q, source, days, limit)
+    return Response(content=dumps({"query": q, "count": len(items), "items": items}), media_type="application/json")
 
 
 @router.post("", response_model=CollectResponse)
-async def collect(request: CollectRequest, client: CollectorClient = Depends(get_collector_client)):
-    if "all" in request.sources or not request.sources:
-        sources_to_collect = get_all_available_sources()
-    else:
-        sources_to_collect = request.sources
+async def collect(
+    request: CollectRequest,
+    client: CollectorClient = Depends(get_collector_client),
+    dedup: DedupProcessor = Depends(get_dedup_processor),
+    executor: ParseExecutor = Depends(get_parse_executor),
+    cache: ResultCache = Depends(get_result_cache),
+    details: Optional[DetailStore] = Depends(get_detail_store),
+    store: Optional[ItemStore] = Depends(get_item_store),
+    push_to: Optional[str] = Query(None, description="逗号分隔的推送目标，仅 --role all 时可用"),
+    push_queue: Optional[PushQueue] = Depends(get_push_queue),
+    ring: Optional[HashRing] = Depends(get_shard_ring),
+):
+    """采集数据
+
+    响应按 CollectResponse 的结构直接编码为 JSON 字节返回，不再经过 pydantic 逐条校验。
+    指定 push_to 时，返回的数据以 ParsedItem 形式经进程内队列交给推送层，
+    响应中的 pushed 为各目标已放入队列的条数。
+    """
+    push_targets = _resolve_push_targets(push_to, push_queue)
+    sources_to_collect = _resolve_sources(request, ring)
+    results = await collect_sources(
+        client,
+        sources_to_collect,
+        request.concurrency,
+        executor,
+        cache=_request_cache(request, cache),
+        details=details,
+        store=store,
+    )
 
     items_by_source = {}
+    cache_info = {}
     errors = []
 
-    for source in sources_to_collect:
-        if source not in SOURCES:
-            errors.append(f"Source config not found: {source}")
-            items_by_source[source] = []
-            continue
+    for result in results:
+        if result.error:
+            errors.append(result.error)
+        items_by_source[result.source] = await _result_items(result, request, dedup)
+        cache_info[result.source] = {"from_cache": result.from_cache, "age": round(result.age, 3)}
 
-        home_url = SOURCES[source]["home_url"]
-        parser = get_parser(source)
+    total_items = sum(len(items) for items in items_by_source.values())
 
-        try:
-            selector = await client.get(home_url)
-            parsed_items = parser.parse_list(selector)
+    payload = {
+        "status": "success" if total_items > 0 else "no_data",
+        "total_sources": len(sources_to_collect),
+        "items_by_source": items_by_source,
+        "total_items": total_items,
+        "errors": errors if errors else None,
+        "cache": cache_info,
+    }
+    if push_targets:
+        to_push = [item for items in items_by_source.values() for item in items]
+        for target in push_targets:
+            await push_queue.put(target, to_push)
+        payload["pushed"] = {target: len(to_push) for target in push_targets}
+
+    content = dumps(payload)
+    return Response(content=content, media_type="application/json")
 
-            if not parsed_items:
-                errors.append(f"No items found from {source}")
-                items_by_source[source] = []
-                continue
 
-            items = []
-            for item in parsed_items:
-                if parser.validate(item):
-                    items.append(item.to_dict())
+@router.post("/stream")
+async def collect_stream(
+    request: CollectRequest,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    client: CollectorClient = Depends(get_collector_client),
+    dedup: DedupProcessor = Depends(get_dedup_processor),
+    executor: ParseExecutor = Depends(get_parse_executor),
+    cache: ResultCache = Depends(get_result_cache),
+    details: Optional[DetailStore] = Depends(get_detail_store),
+    store: Optional[ItemStore] = Depends(get_item_store),
+    ring: Optional[HashRing] = Depends(get_shard_ring),
+):
+    """按数据源完成先后流式返回采集结果
 
-            items_by_source[source] = items
+    每个数据源解析完成即输出一条 {"source", "items", "error", "from_cache", "age"}，
+    全部完成后输出一条 {"done": true, ...} 汇总。
+    """
+    sources_to_collect = _resolve_sources(request, ring)
 
+    async def events() -> AsyncIterator[Dict[str, Any]]:
+        total_items = 0
+        errors = []
+        results = iter_sources(
+            client,
+            sources_to_collect,
+            request.concurrency,
+            executor,
+            cache=_request_cache(request, cache),
+            details=details,
+            store=store,
+        )
+        async for result in results:
+            items = await _result_items(result, request, dedup)
+            total_items += len(items)
+            if result.error:
+                errors.append(result.error)
+            yield {
+                "source": result.source,
+                "items": items,
+                "error": result.error,
+                "from_cache": result.from_cache,
+                "age": round(result.age, 3),
+            }
+        yield {
+            "done": True,
+            "status": "success" if total_items > 0 else "no_data",
+            "total_sources": len(sources_to_collect),
+            "total_items": total_items,
+            "errors": errors if errors else None,
+        }
+
+    if format == "sse":
+        return StreamingResponse(_encode_sse(events()), media_type="text/event-stream")
+    return StreamingResponse(_encode_ndjson(events()), media_type="application/x-ndjson")
+
+
+@router.post("/fanout", response_model=CollectResponse)
+async def collect_fanout(
+    request: CollectRequest,
+    ring: Optional[HashRing] = Depends(get_shard_ring),
+    shard_client: httpx.AsyncClient = Depends(get_shard_client),
+):
+    """按一致性哈希把数据源分发到各分片节点采集，合并各节点的结果
+
+    不可达的节点只影响其负责的数据源，对应错误写入 errors。
+    """
+    if ring is None:
+        raise HTTPException(status_code=400, detail="Shard mode is not configured (shard_nodes)")
+
+    if "all" in request.sources or not request.sources:
+        sources_to_collect = get_all_available_sources()
+    else:
+        sources_to_collect = request.sources
+    shards = ring.assign(sources_to_collect)
+
+    async def call(node: str, sources: List[str]) -> Dict[str, Any]:
+        body = request.model_dump()
+        body["sources"] = sources
+        try:
+            response = await shard_client.post(f"{node.rstrip('/')}/collect", json=body)
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
-            errors.append(f"Fetch error {source}: {str(e)}")
-            items_by_source[source] = []
+            return {"errors": [f"Shard error {node}: {e}"]}
+
+    responses = await asyncio.gather(*[call(node, sources) for node, sources in shards.items()])
 
+    merged: Dict[str, List[Dict[str, Any]]] = {}
+    cache_info: Dict[str, Any] = {}
+    errors: List[str] = []
+    for response in responses:
+        merged.update(response.get("items_by_source") or {})
+        cache_info.update(response.get("cache") or {})
+        errors.extend(response.get("errors") or [])
+
+    items_by_source = {source: merged.get(source, []) for source in sources_to_collect}
     total_items = sum(len(items) for items in items_by_source.values())
+    content = dumps({
+        "status": "success" if total_items > 0 else "no_data",
+        "total_sources": len(sources_to_collect),
+        "items_by_source": items_by_source,
+        "total_items": total_items,
+        "errors": errors if errors else None,
+        "cache": cache_info,
+        "shards": shards,
+    })
+    return Response(content=content, media_type="application/json")
 
-    return CollectResponse(
-        status="success" if total_items > 0 else "no_data",
-        total_sources=len(sources_to_collect),
-        items_by_source=items_by_source,
-        total_items=total_items,
-        errors=errors if errors else None,
-    )
+
+async def _encode_ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield dumps(event) + b"\n"
+
+
+async def _encode_sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for event in events:
+        name = b"done" if event.get("done") else b"source"
+        yield b"event: " + name + b"\ndata: " + dumps(event) + b"\n\n"
@@ -5,6 +5,13 @@ from typing import List, Optional, Dict, Any
 class CollectRequest(BaseModel):
     sources: List[str]
     concurrency: int = 10
+    only_new: bool = False
+    use_cache: bool = True
+
+
+class CacheInfo(BaseModel):
+    from_cache: bool
+    age: float
 
 
 class CollectResponse(BaseModel):
@@ -13,3 +20,30 @@ class CollectResponse(BaseModel):
     items_by_source: Dict[str, List[Dict[str, Any]]]
     total_items: int
     errors: Optional[List[str]] = None
+    cache: Optional[Dict[str, CacheInfo]] = None
+    pushed: Optional[Dict[str, int]] = None
+    shards: Optional[Dict[str, List[str]]] = None
+
+
+class StoredItem(BaseModel):
+    id: int
+    title: str
+    url: str
+    source: Optional[str] = None
+    first_seen: float
+
+
+class ItemsResponse(BaseModel):
+    items: List[StoredItem]
+    next_cursor: int
+    has_more: bool
+
+
+class SearchHit(StoredItem):
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    count: int
+    items: List[SearchHit]
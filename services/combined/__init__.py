@@ -0,0 +1,9 @@
+from fastapi import FastAPI
+from services.collector.router import router as collector_router
+from services.pusher.router import router as pusher_router
+from .deps import lifespan
+
+
+app = FastAPI(title="NewsFlow", lifespan=lifespan)
+app.include_router(collector_router)
+app.include_router(pusher_router)
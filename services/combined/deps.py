@@ -0,0 +1,18 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from typing import AsyncIterator
+from services.collector.deps import lifespan as collector_lifespan
+from services.pusher.deps import lifespan as pusher_lifespan
+from services.pusher.handoff import PushQueue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """采集与推送运行在同一进程，两者之间用进程内队列交接数据"""
+    async with collector_lifespan(app), pusher_lifespan(app):
+        app.state.push_queue = PushQueue(app.state.outbox_worker, app.state.sender_cache)
+        app.state.push_queue.start()
+        try:
+            yield
+        finally:
+            await app.state.push_queue.stop()
@@ -0,0 +1,7 @@
+from fastapi import FastAPI
+from .deps import lifespan
+from .router import router
+
+
+app = FastAPI(title="NewsFlow Pusher", lifespan=lifespan)
+app.include_router(router)
@@ -0,0 +1,33 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from typing import AsyncIterator
+from config import settings
+from .outbox import OutboxWorker, PushOutbox
+from .senders import SenderCache, create_push_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """应用生命周期内所有发送器共享一个长连接客户端"""
+    async with create_push_client() as client:
+        app.state.sender_cache = SenderCache(client)
+        app.state.outbox = PushOutbox(settings.outbox_path)
+        app.state.outbox_worker = OutboxWorker(app.state.outbox, app.state.sender_cache)
+        app.state.outbox_worker.start()
+        try:
+            yield
+        finally:
+            await app.state.outbox_worker.stop()
+            app.state.outbox.close()
+
+
+def get_sender_cache(request: Request) -> SenderCache:
+    return request.app.state.sender_cache
+
+
+def get_outbox(request: Request) -> PushOutbox:
+    return request.app.state.outbox
+
+
+def get_outbox_worker(request: Request) -> OutboxWorker:
+    return request.app.state.outbox_worker
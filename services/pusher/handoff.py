@@ -0,0 +1,101 @@
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+from collector.protocol import ParsedItem
+from config import settings
+from .outbox import OutboxEntry, OutboxWorker
+from .senders import SenderCache
+
+
+class PushQueue:
+    """进程内的采集 → 推送交接队列
+
+    采集服务与推送服务运行在同一进程时，put 先把数据以暂存状态写入 SQLite 发件箱再放入有界队列，
+    由后台消费者直接投递，不再经过 HTTP 请求。暂存的记录不会被 OutboxWorker 取出，
+    消费者取出后才开始计算租约，在队列中等待的时间不会导致重复发送。
+    stop 时未投递的数据放回发件箱由 OutboxWorker 重试；进程崩溃时，下次 start 时放回，
+    与 /push 的持久性相同。队列满时 put 会等待，采集端因此受推送速度的反压。
+    """
+
+    def __init__(
+        self,
+        worker: OutboxWorker,
+        senders: SenderCache,
+        maxsize: Optional[int] = None,
+        consumers: Optional[int] = None,
+    ):
+        self.worker = worker
+        self.senders = senders
+        self.consumers = consumers or settings.push_queue_consumers
+        self._queue: "asyncio.Queue[Tuple[str, List[OutboxEntry]]]" = asyncio.Queue(
+            maxsize=maxsize or settings.push_queue_size
+        )
+        self._tasks: List[asyncio.Task] = []
+        self.accepted = 0
+        self.success = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    async def put(self, target: str, items: List[ParsedItem]) -> None:
+        """写入发件箱后放入队列，返回时数据已持久化；队列满时等待"""
+        if items:
+            entries = await asyncio.to_thread(
+                self.worker.outbox.enqueue, target, [item.to_dict() for item in items], True
+            )
+            self.accepted += len(entries)
+            await self._queue.put((target, entries))
+
+    def start(self) -> None:
+        if not self._tasks:
+            # 上次进程崩溃时暂存、未交接完的数据交给 OutboxWorker 重试
+            self.worker.outbox.release()
+            self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """等待队列中的数据投递一次后停止，超时未投递的数据放回发件箱，由 OutboxWorker 重试"""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout or settings.push_target_timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        ids = []
+        while not self._queue.empty():
+            _, entries = self._queue.get_nowait()
+            ids.extend(entry.id for entry in entries)
+            self._queue.task_done()
+        if ids:
+            await asyncio.to_thread(self.worker.outbox.release, ids)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._queue.qsize(),
+            "maxsize": self._queue.maxsize,
+            "accepted": self.accepted,
+            "success": self.success,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+    async def _consume(self) -> None:
+        while True:
+            target, entries = await self._queue.get()
+            try:
+                config = settings.push_targets.get(target)
+                if config is None:
+                    raise ValueError(f"Unknown target: {target}")
+                sender = self.senders.get(target, config)
+                result = await self.worker.deliver(sender, entries)
+                self.success += result["success"]
+                self.failed += result["failed"]
+            except asyncio.CancelledError:
+                # stop 超时取消了正在进行的投递，未完成的记录放回发件箱
+                await asyncio.to_thread(self.worker.outbox.release, [entry.id for entry in entries])
+                raise
+            except Exception as e:
+                # 记录仍在发件箱中，按退避重试，超过最大次数后进入死信表
+                await asyncio.to_thread(self.worker.outbox.mark_failed, [entry.id for entry in entries], str(e))
+                self.last_error = f"{target}: {e}"
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,388 @@
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Union
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from collector.sqlite import SQLiteStore
+from config import settings
+from .senders import BaseSender, SenderCache, _error_text
+
+
+# 暂存记录的 next_attempt_at，不会到期
+_HELD = float("inf")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target TEXT NOT NULL,
+    item TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+CREATE TABLE IF NOT EXISTS dead_letter (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    item TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class OutboxEntry:
+    id: int
+    target: str
+    item: Dict[str, Any]
+    attempts: int = 0
+    last_error: Optional[str] = None
+    created_at: float = 0.0
+
+
+class PushOutbox(SQLiteStore):
+    """基于 SQLite 的推送发件箱
+
+    每条「数据-目标」投递先写入 outbox 表，成功后标记为 delivered；
+    失败按指数退避加抖动重新排期，超过最大次数后移入 dead_letter 表。
+    取出待投递记录时会设置租约，进程中途退出时记录在租约到期后重新投递。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        lease: Optional[float] = None,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts or settings.outbox_max_attempts
+        self.base_delay = base_delay or settings.outbox_base_delay
+        self.max_delay = max_delay or settings.outbox_max_delay
+        self.lease = lease or settings.outbox_lease
+        super().__init__(path, _SCHEMA)
+
+    def enqueue(self, target: str, items: List[Dict[str, Any]], hold: bool = False) -> List[OutboxEntry]:
+        """写入待投递记录，并直接为本次调用占用租约
+
+        Args:
+            target: 目标标识符
+            items: 数据列表
+            hold: 为 True 时记录不设租约到期时间，后台重试不会取出，
+                直到 renew 开始发送或 release 放回
+
+        Returns:
+            写入的记录
+        """
+        now = time.time()
+        next_attempt_at = _HELD if hold else now + self.lease
+        entries = []
+        with self._lock, self._conn:
+            for item in items:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox (target, item, next_attempt_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (target, json.dumps(item, ensure_ascii=False), next_attempt_at, now, now),
+                )
+                entries.append(OutboxEntry(id=cursor.lastrowid, target=target, item=item, created_at=now))
+        return entries
+
+    def claim_due(self, limit: int = 100) -> List[OutboxEntry]:
+        """取出到期的待投递记录并占用租约"""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                [(now + self.lease, now, row["id"]) for row in rows],
+            )
+        return [self._to_entry(row) for row in rows]
+
+    def renew(self, ids: List[int], lease: float) -> None:
+        """把记录的租约延长到 lease 秒之后，发送耗时超过默认租约时避免被重复取出"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                [(now + lease, now, id_) for id_ in ids],
+            )
+
+    def release(self, ids: Optional[List[int]] = None) -> int:
+        """把暂存（hold）或占用中的待投递记录放回，立即可被后台重试取出
+
+        Args:
+            ids: 要放回的记录 ID，为空时放回全部暂存的记录（进程启动时恢复上次未交接完的数据）
+
+        Returns:
+            放回的数量
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            if ids is None:
+                cursor = self._conn.execute(
+                    "UPDATE outbox SET next_attempt_at = ?, updated_at = ? "
+                    "WHERE status = 'pending' AND next_attempt_at = ?",
+                    (now, now, _HELD),
+                )
+                return cursor.rowcount
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                [(now, now, id_) for id_ in ids],
+            )
+        return len(ids)
+
+    def mark_delivered(self, ids: List[int]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'delivered', last_error = NULL, updated_at = ? WHERE id = ?",
+                [(now, id_) for id_ in ids],
+            )
+
+    def mark_failed(self, ids: List[int], error: Union[str, List[str]]) -> int:
+        """记录投递失败，按退避时间重新排期或移入死信表
+
+        Args:
+            ids: 失败的记录 ID
+            error: 错误信息，为列表时与 ids 一一对应
+
+        Returns:
+            本次移入死信表的数量
+        """
+        now = time.time()
+        errors = [error] * len(ids) if isinstance(error, str) else error
+        dead = 0
+        with self._lock, self._conn:
+            for id_, error in zip(ids, errors):
+                row = self._conn.execute("SELECT * FROM outbox WHERE id = ?", (id_,)).fetchone()
+                if row is None:
+                    continue
+                attempts = row["attempts"] + 1
+                if attempts >= self.max_attempts:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO dead_letter "
+                        "(id, target, item, attempts, last_error, created_at, failed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (id_, row["target"], row["item"], attempts, error, row["created_at"], now),
+                    )
+                    self._conn.execute("DELETE FROM outbox WHERE id = ?", (id_,))
+                    dead += 1
+                else:
+                    self._conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? "
+                        "WHERE id = ?",
+                        (attempts, now + self.backoff(attempts), error, now, id_),
+                    )
+        return dead
+
+    def backoff(self, attempts: int) -> float:
+        """第 attempts 次失败后的重试间隔，指数增长并带一半幅度的随机抖动"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def list_dead(self, limit: int = 100, offset: int = 0) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM dead_letter ORDER BY failed_at DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def replay_dead(self, ids: Optional[List[int]] = None) -> int:
+        """将死信重新放回发件箱立即投递
+
+        Args:
+            ids: 要重放的死信 ID，为空时重放全部
+
+        Returns:
+            重放的数量
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            if ids:
+                placeholders = ",".join("?" for _ in ids)
+                rows = self._conn.execute(
+                    f"SELECT * FROM dead_letter WHERE id IN ({placeholders})", ids
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT * FROM dead_letter").fetchall()
+            for row in rows:
+                self._conn.execute(
+                    "INSERT INTO outbox (target, item, next_attempt_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (row["target"], row["item"], now, row["created_at"], now),
+                )
+                self._conn.execute("DELETE FROM dead_letter WHERE id = ?", (row["id"],))
+        return len(rows)
+
+    def purge_delivered(self, older_than: float) -> int:
+        """删除早于指定秒数之前投递成功的记录"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = 'delivered' AND updated_at < ?",
+                (time.time() - older_than,),
+            )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(
+                self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+            )
+            dead = self._conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0]
+        return {
+            "pending": counts.get("pending", 0),
+            "delivered": counts.get("delivered", 0),
+            "dead": dead,
+        }
+
+    def _to_entry(self, row: sqlite3.Row) -> OutboxEntry:
+        return OutboxEntry(
+            id=row["id"],
+            target=row["target"],
+            item=json.loads(row["item"]),
+            attempts=row["attempts"],
+            last_error=row["last_error"],
+            created_at=row["created_at"],
+        )
+
+
+class OutboxWorker:
+    """发件箱投递器
+
+    负责首次投递与后台重试，两者共用同一投递逻辑。
+    """
+
+    def __init__(
+        self,
+        outbox: PushOutbox,
+        senders: SenderCache,
+        interval: Optional[float] = None,
+    ):
+        self.outbox = outbox
+        self.senders = senders
+        self.interval = interval or settings.outbox_poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        target: str,
+        sender: BaseSender,
+        items: List[Dict[str, Any]],
+    ) -> Dict[str, int]:
+        """写入发件箱后立即投递一次
+
+        Returns:
+            {"success": 成功数, "failed": 移入死信表的数量, "queued": 等待重试数}
+        """
+        entries = await asyncio.to_thread(self.outbox.enqueue, target, items)
+        return await self.deliver(sender, entries)
+
+    async def deliver(self, sender: BaseSender, entries: List[OutboxEntry]) -> Dict[str, int]:
+        """投递同一目标的一组记录，每条消息发送完成后立即更新发件箱
+
+        发送前把租约延长到覆盖整个发送时限（含限速排队），
+        发送期间后台重试不会再次取出这些记录。
+
+        Returns:
+            {"success": 成功数, "failed": 本次移入死信表的数量, "queued": 等待重试数}
+        """
+        items = [entry.item for entry in entries]
+        timeout = settings.push_target_timeout + sender.estimated_delay(len(items))
+        await asyncio.to_thread(self.outbox.renew, [entry.id for entry in entries], timeout + self.outbox.lease)
+
+        recorded = set()
+        counts = {"success": 0, "failed": 0, "queued": 0}
+
+        async def record(indices: List[int], error: Optional[str]) -> None:
+            indices = [index for index in indices if index not in recorded]
+            # 先登记再写库，超时取消时已提交的写入不会被当作未完成再记一次失败
+            recorded.update(indices)
+            ids = [entries[index].id for index in indices]
+            if not ids:
+                return
+            if error is None:
+                counts["success"] += len(ids)
+                await asyncio.to_thread(self.outbox.mark_delivered, ids)
+            else:
+                dead = await asyncio.to_thread(self.outbox.mark_failed, ids, error)
+                counts["failed"] += dead
+                counts["queued"] += len(ids) - dead
+
+        try:
+            results = await asyncio.wait_for(sender.send_each(items, record), timeout=timeout)
+        except asyncio.TimeoutError:
+            results = ["Push timeout"] * len(items)
+        except Exception as e:
+            results = [_error_text(e)] * len(items)
+
+        # 未回调 on_result 的发送器与超时后未完成的数据按返回值记录
+        remaining: Dict[Optional[str], List[int]] = {}
+        for index, error in enumerate(results):
+            if index not in recorded:
+                remaining.setdefault(error, []).append(index)
+        for error, indices in remaining.items():
+            await record(indices, error)
+        return counts
+
+    async def run_once(self) -> int:
+        """投递一轮到期记录，返回处理的记录数"""
+        entries = await asyncio.to_thread(self.outbox.claim_due)
+        by_target: Dict[str, List[OutboxEntry]] = {}
+        for entry in entries:
+            by_target.setdefault(entry.target, []).append(entry)
+
+        tasks = []
+        for target, target_entries in by_target.items():
+            config = settings.push_targets.get(target)
+            try:
+                if config is None:
+                    raise ValueError(f"Unknown target: {target}")
+                sender = self.senders.get(target, config)
+            except ValueError as e:
+                ids = [entry.id for entry in target_entries]
+                await asyncio.to_thread(self.outbox.mark_failed, ids, str(e))
+                continue
+            tasks.append(self.deliver(sender, target_entries))
+
+        await asyncio.gather(*tasks)
+        return len(entries)
+
+    async def run(self) -> None:
+        """后台循环：投递到期记录并清理过期的成功记录"""
+        while True:
+            try:
+                processed = await self.run_once()
+                await asyncio.to_thread(self.outbox.purge_delivered, settings.outbox_retention)
+            except Exception as e:
+                # 不退出循环，下一轮继续重试；记录错误以免重试投递静默失效
+                print(f"[Outbox] 重试投递出错: {_error_text(e)}")
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,85 @@
+from typing import Dict, Any
+import asyncio
+import time
+
+
+class TokenBucket:
+    """令牌桶限速器
+
+    按固定速率补充令牌，获取不到令牌的调用按先后顺序排队等待，
+    而不是直接失败。
+
+    Example:
+        limiter = TokenBucket(per_minute=20, burst=1)
+        await limiter.acquire()
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.configure(per_minute, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    def configure(self, per_minute: float, burst: int = 1) -> None:
+        """更新速率配置，已排队的调用按新速率继续等待
+
+        Args:
+            per_minute: 每分钟允许的请求数
+            burst: 桶容量，即允许的瞬时突发数
+        """
+        if not _is_number(per_minute) or per_minute <= 0:
+            raise ValueError(f"Invalid rate limit per_minute: {per_minute!r}")
+        if not _is_number(burst):
+            raise ValueError(f"Invalid rate limit burst: {burst!r}")
+        self.per_minute = float(per_minute)
+        self.rate = self.per_minute / 60.0
+        self.burst = max(1, int(burst))
+
+    async def acquire(self) -> None:
+        """获取一个令牌，令牌不足时排队等待"""
+        self._waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self._waiting -= 1
+
+    @property
+    def queue_depth(self) -> int:
+        """当前排队等待令牌的调用数"""
+        return self._waiting
+
+    def drain_time(self, extra: int = 0) -> float:
+        """预计排空当前队列所需秒数
+
+        Args:
+            extra: 额外计入的待发送数量
+
+        Returns:
+            预计等待秒数
+        """
+        self._refill()
+        deficit = self._waiting + extra - self._tokens
+        return max(0.0, deficit / self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "per_minute": self.per_minute,
+            "burst": self.burst,
+            "queue_depth": self.queue_depth,
+            "drain_seconds": round(self.drain_time(), 3),
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
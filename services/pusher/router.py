@@ -1,7 +1,22 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from dataclasses import asdict
 from typing import List, Dict, Any
-from .schemas import PushRequest, PushResponse, TargetListResponse
-from .senders import SENDERS
+import asyncio
+from .schemas import (
+    DeadLetterListResponse,
+    OutboxStats,
+    PushRequest,
+    PushResponse,
+    QueueInfo,
+    QueueListResponse,
+    ReplayRequest,
+    ReplayResponse,
+    TargetListResponse,
+    TargetResult,
+)
+from .outbox import OutboxWorker, PushOutbox
+from .senders import BaseSender, SenderCache
+from .deps import get_outbox, get_outbox_worker, get_sender_cache
 from config import settings
 
 
@@ -20,21 +35,52 @@ def get_target_config(target: str) -> Dict[str, Any]:
     return settings.push_targets[target]
 
 
+def _get_sender(target: str, senders: SenderCache) -> BaseSender:
+    """获取目标对应的发送器（按配置缓存）"""
+    config = get_target_config(target)
+    try:
+        return senders.get(target, config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 async def _push_to_target(
     target: str,
     items: List[Dict[str, Any]],
+    senders: SenderCache,
+    worker: OutboxWorker,
 ) -> Dict[str, int]:
-    """推送消息到单个目标"""
-    config = get_target_config(target)
-    sender_type = config.get("type", "unknown")
-    url = config.get("webhook_url")
-    
-    sender_class = SENDERS.get(sender_type)
-    if not sender_class:
-        raise HTTPException(status_code=400, detail=f"Unknown sender type: {sender_type}")
-    
-    sender = sender_class(webhook_url=url)
-    return await sender.send_batch(items)
+    """经发件箱推送消息到单个目标，失败的数据由后台重试"""
+    sender = _get_sender(target, senders)
+    return await worker.submit(target, sender, items)
+
+
+async def _push_and_report(
+    target: str,
+    items: List[Dict[str, Any]],
+    senders: SenderCache,
+    worker: OutboxWorker,
+) -> TargetResult:
+    """推送到单个目标并汇总结果，目标无效时整批计为失败"""
+    try:
+        result = await _push_to_target(target, items, senders, worker)
+    except HTTPException as e:
+        return TargetResult(name=target, success_count=0, failed_count=len(items), error=e.detail)
+    except Exception as e:
+        return TargetResult(name=target, success_count=0, failed_count=len(items), error=str(e))
+    return TargetResult(
+        name=target,
+        success_count=result["success"],
+        failed_count=result["failed"],
+        queued_count=result["queued"],
+    )
+
+
+def _push_status(success: int, queued: int) -> str:
+    """有成功投递时为 success；没有成功但有等待重试的数据时为 queued；否则为 failed"""
+    if success > 0:
+        return "success"
+    return "queued" if queued > 0 else "failed"
 
 
 @router.get("/targets", response_model=TargetListResponse)
@@ -50,8 +96,29 @@ async def list_targets():
     return {"targets": targets}
 
 
+@router.get("/queues", response_model=QueueListResponse)
+async def list_queues(senders: SenderCache = Depends(get_sender_cache)):
+    """列出各目标的限速配置、排队数量与预计排空时间"""
+    queues = []
+    for name, config in settings.push_targets.items():
+        if not config.get("webhook_url"):
+            continue
+        try:
+            sender = senders.get(name, config)
+        except ValueError:
+            continue
+        if sender.limiter is None:
+            continue
+        queues.append(QueueInfo(name=name, **sender.limiter.stats()))
+    return {"queues": queues}
+
+
 @router.post("", response_model=PushResponse)
-async def push(request: PushRequest):
+async def push(
+    request: PushRequest,
+    senders: SenderCache = Depends(get_sender_cache),
+    worker: OutboxWorker = Depends(get_outbox_worker),
+):
     """推送消息到目标"""
     is_all = "all" in request.targets or not request.targets
 
@@ -63,27 +130,50 @@ async def push(request: PushRequest):
     if not targets_to_push:
         raise HTTPException(status_code=400, detail="No available targets")
     
-    total_success = 0
-    total_failed = 0
-    
-    for target in targets_to_push:
-        try:
-            result = await _push_to_target(target, request.items)
-            total_success += result["success"]
-            total_failed += result["failed"]
-        except HTTPException as e:
-            total_failed += len(request.items)
-        except Exception:
-            total_failed += len(request.items)
+    results = await asyncio.gather(
+        *[_push_and_report(target, request.items, senders, worker) for target in targets_to_push]
+    )
+    total_success = sum(result.success_count for result in results)
+    total_failed = sum(result.failed_count for result in results)
+    total_queued = sum(result.queued_count for result in results)
     
     return PushResponse(
-        status="success" if total_success > 0 else "failed",
+        status=_push_status(total_success, total_queued),
         target_type="all" if is_all else "batch",
         success_count=total_success,
-        failed_count=total_failed
+        failed_count=total_failed,
+        queued_count=total_queued,
+        targets=results if request.detail else None,
     )
 
 
+@router.get("/outbox", response_model=OutboxStats)
+async def outbox_stats(outbox: PushOutbox = Depends(get_outbox)):
+    """发件箱各状态的记录数"""
+    return await asyncio.to_thread(outbox.stats)
+
+
+@router.get("/outbox/dead", response_model=DeadLetterListResponse)
+async def list_dead_letters(
+    limit: int = 100,
+    offset: int = 0,
+    outbox: PushOutbox = Depends(get_outbox),
+):
+    """列出超过最大重试次数的死信"""
+    entries = await asyncio.to_thread(outbox.list_dead, limit, offset)
+    return {"items": [asdict(entry) for entry in entries]}
+
+
+@router.post("/outbox/dead/replay", response_model=ReplayResponse)
+async def replay_dead_letters(
+    request: ReplayRequest,
+    outbox: PushOutbox = Depends(get_outbox),
+):
+    """将死信放回发件箱重新投递，未指定 ids 时重放全部"""
+    replayed = await asyncio.to_thread(outbox.replay_dead, request.ids)
+    return {"replayed": replayed}
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
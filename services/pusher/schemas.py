@@ -5,6 +5,15 @@ from typing import List, Dict, Any, Optional
 class PushRequest(BaseModel):
     items: List[Dict[str, Any]]
     targets: List[str]
+    detail: bool = False
+
+
+class TargetResult(BaseModel):
+    name: str
+    success_count: int
+    failed_count: int
+    queued_count: int = 0
+    error: Optional[str] = None
 
 
 class PushResponse(BaseModel):
@@ -12,6 +21,8 @@ class PushResponse(BaseModel):
     target_type: str
     success_count: int
     failed_count: int
+    queued_count: int = 0
+    targets: Optional[List[TargetResult]] = None
 
 
 class TargetInfo(BaseModel):
@@ -22,3 +33,42 @@ class TargetInfo(BaseModel):
 
 class TargetListResponse(BaseModel):
     targets: List[TargetInfo]
+
+
+class QueueInfo(BaseModel):
+    name: str
+    per_minute: float
+    burst: int
+    queue_depth: int
+    drain_seconds: float
+
+
+class QueueListResponse(BaseModel):
+    queues: List[QueueInfo]
+
+
+class OutboxStats(BaseModel):
+    pending: int
+    delivered: int
+    dead: int
+
+
+class DeadLetter(BaseModel):
+    id: int
+    target: str
+    item: Dict[str, Any]
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: float
+
+
+class DeadLetterListResponse(BaseModel):
+    items: List[DeadLetter]
+
+
+class ReplayRequest(BaseModel):
+    ids: Optional[List[int]] = None
+
+
+class ReplayResponse(BaseModel):
+    replayed: int
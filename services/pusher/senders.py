@@ -1,12 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import asyncio
+import json
 import httpx
+from config import settings
+from processor.formatter import pack_batch
+from .ratelimit import TokenBucket
+
+
+# 每条消息发送完成后的回调：(该消息包含的数据下标, 错误信息，成功为 None)
+ResultCallback = Callable[[List[int], Optional[str]], Awaitable[None]]
+
+
+def create_push_client() -> httpx.AsyncClient:
+    """创建推送服务共享的长连接客户端"""
+    return httpx.AsyncClient(
+        headers={"User-Agent": "NewsFlow-Pusher/1.0"},
+        timeout=settings.push_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.pool_max_connections,
+            max_keepalive_connections=settings.pool_max_keepalive,
+            keepalive_expiry=settings.pool_keepalive_expiry,
+        ),
+    )
 
 
 class BaseSender(ABC):
     """推送发送器抽象基类"""
     
     sender_type: str = "base"
+    default_rate_limit: Optional[Dict[str, Any]] = None
+    
+    def __init__(
+        self,
+        webhook_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        concurrency: Optional[int] = None,
+        limiter: Optional[TokenBucket] = None,
+        coalesce: bool = False,
+    ):
+        self.webhook_url = webhook_url
+        self.client = client
+        self.concurrency = max(1, concurrency or settings.push_concurrency)
+        self.limiter = limiter
+        self.coalesce = coalesce
+    
+    def estimated_delay(self, count: int) -> float:
+        """按限速估算发送 count 条消息需要额外排队的秒数"""
+        if self.limiter is None:
+            return 0.0
+        return self.limiter.drain_time(count)
     
     @abstractmethod
     async def send(self, item: Dict[str, Any]) -> bool:
@@ -18,6 +61,29 @@ class BaseSender(ABC):
         """批量发送消息"""
         pass
     
+    async def send_each(
+        self,
+        items: List[Dict[str, Any]],
+        on_result: Optional[ResultCallback] = None,
+    ) -> List[Optional[str]]:
+        """批量发送并返回每条数据的错误信息，发送成功为 None，默认逐条调用 send
+
+        Args:
+            items: 数据列表
+            on_result: 每条消息发送完成后立即回调，调用方据此逐条记录结果
+        """
+        results: List[Optional[str]] = []
+        for index, item in enumerate(items):
+            try:
+                ok = await self.send(item)
+                error = None if ok else f"{self.sender_type} send failed"
+            except Exception as e:
+                error = _error_text(e)
+            results.append(error)
+            if on_result:
+                await on_result([index], error)
+        return results
+    
     @abstractmethod
     def validate_config(self) -> bool:
         """验证配置是否有效"""
@@ -27,31 +93,80 @@ class BaseSender(ABC):
 class WeChatSender(BaseSender):
     """企业微信群机器人发送器"""
     sender_type: str = "wechat"
-    
-    def __init__(self, webhook_url: str):
-        self.webhook_url = webhook_url
+    default_rate_limit: Optional[Dict[str, Any]] = {"per_minute": 20, "burst": 1}
+    max_markdown_bytes: int = 4096
     
     async def send(self, item: Dict[str, Any]) -> bool:
         """发送单条消息到微信"""
-        payload = self._format_message(item)
-        headers = {"User-Agent": "NewsFlow-Pusher/1.0"}
-        async with httpx.AsyncClient(headers=headers, timeout=10.0) as client:
-            response = await client.post(self.webhook_url, json=payload)
-            data = response.json()
-            return data.get("errcode") == 0
+        if self.limiter:
+            await self.limiter.acquire()
+        return await self._deliver(self._format_message(item)) is None
     
     async def send_batch(self, items: List[Dict[str, Any]]) -> Dict[str, int]:
         """批量发送"""
-        success, failed = 0, 0
-        for item in items:
-            try:
-                if await self.send(item):
-                    success += 1
-                else:
-                    failed += 1
-            except Exception:
-                failed += 1
-        return {"success": success, "failed": failed}
+        results = await self.send_each(items)
+        success = sum(1 for error in results if error is None)
+        return {"success": success, "failed": len(results) - success}
+    
+    async def send_each(
+        self,
+        items: List[Dict[str, Any]],
+        on_result: Optional[ResultCallback] = None,
+    ) -> List[Optional[str]]:
+        """批量发送，按限速排队，同时进行的请求数不超过 concurrency
+
+        开启 coalesce 时多条数据合并为尽量少的 Markdown 消息，
+        一条合并消息发送成功即计入其包含的全部数据。
+        每条消息发送完成后立即以其包含的数据下标回调 on_result。
+        """
+        messages = self._build_messages(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_with_limit(payload: Dict[str, Any], indices: List[int]) -> Optional[str]:
+            if self.limiter:
+                await self.limiter.acquire()
+            async with semaphore:
+                try:
+                    error = await self._deliver(payload)
+                except Exception as e:
+                    error = _error_text(e)
+            if on_result:
+                await on_result(indices, error)
+            return error
+
+        tasks = []
+        start = 0
+        for payload, count in messages:
+            tasks.append(send_with_limit(payload, list(range(start, start + count))))
+            start += count
+        results = await asyncio.gather(*tasks)
+        outcome: List[Optional[str]] = []
+        for error, (_, count) in zip(results, messages):
+            outcome.extend([error] * count)
+        return outcome
+    
+    def _build_messages(self, items: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+        """生成 (消息体, 包含的数据条数) 列表"""
+        if not self.coalesce:
+            return [(self._format_message(item), 1) for item in items]
+        return [
+            (self._markdown_payload(content), count)
+            for content, count in pack_batch(items, "markdown", self.max_markdown_bytes)
+        ]
+    
+    async def _deliver(self, payload: Dict[str, Any]) -> Optional[str]:
+        """发送一条消息，返回错误信息，成功时为 None"""
+        if self.client is None:
+            async with create_push_client() as client:
+                return await self._post(client, payload)
+        return await self._post(self.client, payload)
+    
+    async def _post(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> Optional[str]:
+        response = await client.post(self.webhook_url, json=payload)
+        data = response.json()
+        if data.get("errcode") == 0:
+            return None
+        return f"WeChat errcode {data.get('errcode')}: {data.get('errmsg', '')}"
     
     def validate_config(self) -> bool:
         """验证 webhook_url 是否有效"""
@@ -68,6 +183,9 @@ class WeChatSender(BaseSender):
 ---
 [点击查看详情]({url})"""
         
+        return self._markdown_payload(content)
+    
+    def _markdown_payload(self, content: str) -> Dict[str, Any]:
         return {
             "msgtype": "markdown",
             "markdown": {"content": content}
@@ -77,9 +195,6 @@ class WeChatSender(BaseSender):
 class DingTalkSender(BaseSender):
     sender_type: str = "dingtalk"
     
-    def __init__(self, webhook_url: str):
-        self.webhook_url = webhook_url
-    
     async def send(self, item: Dict[str, Any]) -> bool:
         return False
     
@@ -93,9 +208,6 @@ class DingTalkSender(BaseSender):
 class EmailSender(BaseSender):
     sender_type: str = "email"
     
-    def __init__(self, webhook_url: str):
-        self.webhook_url = webhook_url
-    
     async def send(self, item: Dict[str, Any]) -> bool:
         return False
     
@@ -109,9 +221,6 @@ class EmailSender(BaseSender):
 class QQSender(BaseSender):
     sender_type: str = "qq"
     
-    def __init__(self, webhook_url: str):
-        self.webhook_url = webhook_url
-    
     async def send(self, item: Dict[str, Any]) -> bool:
         return False
     
@@ -122,9 +231,84 @@ class QQSender(BaseSender):
         return False
 
 
+def _error_text(error: Exception) -> str:
+    """异常的错误信息，无消息的异常（如超时）使用异常类型名"""
+    return str(error) or type(error).__name__
+
+
 SENDERS: Dict[str, type] = {
     "wechat": WeChatSender,
     "dingtalk": DingTalkSender,
     "email": EmailSender,
     "qq": QQSender,
 }
+
+
+class SenderCache:
+    """按目标配置缓存发送器实例
+
+    同一目标在配置不变时复用同一个发送器，配置变更后自动重建。
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self._senders: Dict[str, Tuple[str, BaseSender]] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+
+    def get(self, target: str, config: Dict[str, Any]) -> BaseSender:
+        """获取目标对应的发送器
+
+        Args:
+            target: 目标标识符
+            config: 目标配置，来自 settings.push_targets
+
+        Returns:
+            发送器实例
+
+        Raises:
+            ValueError: 未知的发送器类型
+        """
+        fingerprint = json.dumps(config, sort_keys=True, default=str)
+        cached = self._senders.get(target)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        sender_type = config.get("type", "unknown")
+        sender_class = SENDERS.get(sender_type)
+        if not sender_class:
+            raise ValueError(f"Unknown sender type: {sender_type}")
+        sender = sender_class(
+            webhook_url=config.get("webhook_url"),
+            client=self.client,
+            limiter=self._get_limiter(config, sender_class.default_rate_limit),
+            coalesce=bool(config.get("coalesce", False)),
+        )
+        self._senders[target] = (fingerprint, sender)
+        return sender
+
+    def _get_limiter(
+        self,
+        config: Dict[str, Any],
+        default: Optional[Dict[str, Any]],
+    ) -> Optional[TokenBucket]:
+        """获取 webhook 对应的限速器，同一 webhook 的多个目标共享配额
+
+        Raises:
+            ValueError: rate_limit 不是字典，或缺少数值型的 per_minute
+        """
+        rate_limit = config.get("rate_limit", default)
+        webhook_url = config.get("webhook_url")
+        if not rate_limit or not webhook_url:
+            return None
+        if not isinstance(rate_limit, dict):
+            raise ValueError(f"Invalid rate_limit: {rate_limit!r}")
+
+        per_minute = rate_limit.get("per_minute")
+        burst = rate_limit.get("burst", 1)
+        limiter = self._limiters.get(webhook_url)
+        if limiter is None:
+            limiter = TokenBucket(per_minute=per_minute, burst=burst)
+            self._limiters[webhook_url] = limiter
+        else:
+            limiter.configure(per_minute=per_minute, burst=burst)
+        return limiter
@@ -0,0 +1,40 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from typing import AsyncIterator
+from config import settings
+from services.collector.deps import lifespan as collector_lifespan
+from services.pusher.deps import lifespan as pusher_lifespan
+from .scheduler import ScheduledJob, Scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """复用采集服务与推送服务的共享资源，在同一进程内运行定时任务"""
+    async with collector_lifespan(app), pusher_lifespan(app):
+        jobs = [ScheduledJob.from_config(name, config) for name, config in settings.schedule_jobs.items()]
+        app.state.scheduler = Scheduler(
+            jobs,
+            client=app.state.collector_client,
+            executor=app.state.parse_executor,
+            senders=app.state.sender_cache,
+            worker=app.state.outbox_worker,
+            details=app.state.detail_store,
+            store=app.state.item_store,
+            ring=app.state.shard_ring,
+        )
+        app.state.scheduler.start()
+        try:
+            yield
+        finally:
+            await app.state.scheduler.stop()
+
+
+def get_scheduler(request: Request) -> Scheduler:
+    return request.app.state.scheduler
+
+
+def get_job(name: str, request: Request) -> ScheduledJob:
+    job = request.app.state.scheduler.jobs.get(name)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {name}")
+    return job
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from .deps import get_job, get_scheduler
+from .scheduler import ScheduledJob, Scheduler
+
+
+router = APIRouter(prefix="/schedule", tags=["scheduler"])
+
+
+@router.get("/jobs")
+async def list_jobs(scheduler: Scheduler = Depends(get_scheduler)):
+    return {"jobs": [job.stats() for job in scheduler.jobs.values()]}
+
+
+@router.post("/jobs/{name}/run")
+async def run_job(
+    job: ScheduledJob = Depends(get_job),
+    scheduler: Scheduler = Depends(get_scheduler),
+):
+    """立即运行一次任务，任务正在运行时跳过"""
+    ran = await scheduler.run_job(job)
+    return {"ran": ran, **job.stats()}
+
+
+@router.get("/health")
+async def health_check():
+    return {"status": "healthy"}
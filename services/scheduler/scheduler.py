@@ -0,0 +1,223 @@
+from typing import List, Dict, Any, Optional, Union
+import asyncio
+import random
+import re
+import time
+from pathlib import Path
+from collector.client import CollectorClient
+from collector.detail import DetailStore
+from collector.engine import collect_sources
+from collector.executor import ParseExecutor
+from collector.sharding import HashRing
+from collector.store import ItemStore
+from config import settings
+from processor import DataProcessor
+from services.collector.router import resolve_sources
+from services.pusher.outbox import OutboxWorker
+from services.pusher.senders import SenderCache
+
+
+def job_dedup_path(job: str) -> str:
+    """任务专用的去重索引路径，如 data/seen.db 对应 data/seen.job-headlines.db"""
+    path = Path(settings.dedup_path)
+    safe = re.sub(r"[^\w.-]", "_", job)
+    return str(path.with_name(f"{path.stem}.job-{safe}{path.suffix}"))
+
+
+class ScheduledJob:
+    """定时任务：采集 → 处理 → 推送
+
+    sources 与 /collect 相同，"all" 在每次运行时展开为本节点负责的数据源（见 resolve_sources）。
+    处理链在创建任务时按 ProcessorRegistry 构建一次，去重等有状态的处理器在多次运行间共享。
+    未指定 path 的 dedup 处理器使用按任务名区分的独立索引（见 job_dedup_path），
+    不与其他任务或 /collect 的 only_new 共享已见记录。
+
+    Example:
+        job = ScheduledJob(
+            "headlines",
+            sources=["sina", "163"],
+            targets=["wechat_main"],
+            interval=600,
+            processors=["dedup", {"name": "near_dedup", "threshold": 0.6}],
+        )
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sources: List[str],
+        targets: List[str],
+        interval: float,
+        jitter: Optional[float] = None,
+        processors: Optional[List[Union[str, Dict[str, Any]]]] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.name = name
+        self.sources = list(sources)
+        self.targets = list(targets)
+        self.interval = interval
+        self.jitter = interval * settings.schedule_jitter if jitter is None else jitter
+        self.concurrency = concurrency
+        self.processor = DataProcessor()
+        for spec in processors or []:
+            config = {"name": spec} if isinstance(spec, str) else dict(spec)
+            name = config.pop("name")
+            if name == "dedup":
+                config.setdefault("path", job_dedup_path(self.name))
+            self.processor.add_processor_by_name(name, **config)
+
+        self.runs = 0
+        self.skipped = 0
+        self.last_started: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_collected = 0
+        self.last_pushed: Dict[str, Dict[str, int]] = {}
+        self.last_error: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "ScheduledJob":
+        return cls(
+            name,
+            sources=config["sources"],
+            targets=config.get("targets", []),
+            interval=config["interval"],
+            jitter=config.get("jitter"),
+            processors=config.get("processors"),
+            concurrency=config.get("concurrency"),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def next_delay(self) -> float:
+        """下一次运行前的等待时间，在 interval 上下随机浮动 jitter 秒"""
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "sources": self.sources,
+            "targets": self.targets,
+            "interval": self.interval,
+            "jitter": self.jitter,
+            "processors": self.processor.processor_count,
+            "running": self.running,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_collected": self.last_collected,
+            "last_pushed": self.last_pushed,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """进程内定时调度器
+
+    每个任务一个循环，上一次运行结束后按 interval ± jitter 等待再运行下一次；
+    同一任务正在运行时，手动触发会被跳过，因此同一任务不会重叠运行。
+    采集、处理和推送直接调用对应模块，数据不经过 HTTP 序列化。
+    """
+
+    def __init__(
+        self,
+        jobs: List[ScheduledJob],
+        client: CollectorClient,
+        executor: ParseExecutor,
+        senders: SenderCache,
+        worker: OutboxWorker,
+        details: Optional[DetailStore] = None,
+        store: Optional[ItemStore] = None,
+        ring: Optional[HashRing] = None,
+    ):
+        self.jobs = {job.name: job for job in jobs}
+        self.client = client
+        self.executor = executor
+        self.senders = senders
+        self.worker = worker
+        self.details = details
+        self.store = store
+        self.ring = ring
+        self._tasks: List[asyncio.Task] = []
+
+    async def run_job(self, job: ScheduledJob) -> bool:
+        """运行一次任务，任务正在运行时跳过
+
+        Returns:
+            是否实际运行
+        """
+        if job.running:
+            job.skipped += 1
+            return False
+
+        async with job._lock:
+            job.runs += 1
+            job.last_started = time.time()
+            started = time.monotonic()
+            try:
+                await self._run(job)
+                job.last_error = None
+            except Exception as e:
+                job.last_error = str(e)
+            finally:
+                job.last_duration = round(time.monotonic() - started, 3)
+        return True
+
+    async def _run(self, job: ScheduledJob) -> None:
+        results = await collect_sources(
+            self.client,
+            resolve_sources(job.sources, self.ring),
+            job.concurrency,
+            self.executor,
+            details=self.details,
+            store=self.store,
+        )
+        items = [item.to_dict() for result in results for item in result.items]
+        job.last_collected = len(items)
+        items = await job.processor.run_with_raw_output(items)
+
+        errors = [result.error for result in results if result.error]
+        pushed: Dict[str, Dict[str, int]] = {}
+        if items:
+            outcomes = await asyncio.gather(
+                *[self._push(target, items) for target in job.targets],
+                return_exceptions=True,
+            )
+            for target, outcome in zip(job.targets, outcomes):
+                if isinstance(outcome, Exception):
+                    pushed[target] = {"success": 0, "failed": len(items), "queued": 0}
+                    errors.append(f"Push error {target}: {outcome}")
+                else:
+                    pushed[target] = outcome
+        job.last_pushed = pushed
+
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+    async def _push(self, target: str, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        config = settings.push_targets.get(target)
+        if config is None:
+            raise ValueError(f"Unknown target: {target}")
+        sender = self.senders.get(target, config)
+        return await self.worker.submit(target, sender, items)
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        await asyncio.sleep(random.uniform(0, job.jitter))
+        while True:
+            await self.run_job(job)
+            await asyncio.sleep(job.next_delay())
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._loop(job)) for job in self.jobs.values()]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self.jobs.values():
+            job.processor.close()
@@ -0,0 +1,141 @@
+"""
+发件箱投递回归测试
+
+用法：python -m pytest -q tests
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from collector.protocol import ParsedItem
+from config import settings
+from services.pusher.handoff import PushQueue
+from services.pusher.outbox import OutboxWorker, PushOutbox
+from services.pusher.senders import SenderCache
+
+WEBHOOK = "https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key=test"
+
+
+@pytest.fixture
+def wechat_target(monkeypatch):
+    """只含一个限速 60 条/分钟的企业微信目标，默认租约 2 秒"""
+    monkeypatch.setattr(settings, "push_targets", {
+        "test": {"type": "wechat", "webhook_url": WEBHOOK, "rate_limit": {"per_minute": 60, "burst": 1}},
+    })
+    monkeypatch.setattr(settings, "push_target_timeout", 5.0)
+
+
+def _recording_client(posts: list) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(json.loads(request.content))
+        return httpx.Response(200, json={"errcode": 0, "errmsg": "ok"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_slow_batch_is_not_resent_by_retry_loop(tmp_path, wechat_target):
+    """限速发送耗时超过默认租约时，后台重试不会重复发送仍在发送中的记录"""
+    posts = []
+
+    async def scenario():
+        outbox = PushOutbox(str(tmp_path / "outbox.db"), lease=2.0)
+        async with _recording_client(posts) as client:
+            senders = SenderCache(client)
+            worker = OutboxWorker(outbox, senders, interval=0.2)
+            sender = senders.get("test", settings.push_targets["test"])
+            items = [{"title": f"t{i}", "url": f"https://example.com/{i}", "source": "test"} for i in range(6)]
+
+            submit = asyncio.create_task(worker.submit("test", sender, items))
+            while not submit.done():
+                await worker.run_once()
+                await asyncio.sleep(0.2)
+            result = submit.result()
+        stats = outbox.stats()
+        outbox.close()
+        return result, stats
+
+    result, stats = asyncio.run(scenario())
+    assert result == {"success": 6, "failed": 0, "queued": 0}
+    assert len(posts) == 6
+    assert stats["delivered"] == 6 and stats["pending"] == 0
+
+
+def test_messages_are_recorded_as_they_complete(tmp_path, wechat_target):
+    """批次仍在发送时，已发送的消息已标记为成功"""
+    posts = []
+
+    async def scenario():
+        outbox = PushOutbox(str(tmp_path / "outbox.db"), lease=2.0)
+        async with _recording_client(posts) as client:
+            senders = SenderCache(client)
+            worker = OutboxWorker(outbox, senders)
+            sender = senders.get("test", settings.push_targets["test"])
+            items = [{"title": f"t{i}", "url": f"https://example.com/{i}", "source": "test"} for i in range(3)]
+
+            submit = asyncio.create_task(worker.submit("test", sender, items))
+            await asyncio.sleep(1.5)
+            during = outbox.stats()
+            await submit
+        outbox.close()
+        return during
+
+    during = asyncio.run(scenario())
+    assert 1 <= during["delivered"] < 3
+
+
+def test_handoff_backlog_is_not_resent_by_retry_loop(tmp_path, wechat_target):
+    """在交接队列中等待超过默认租约的数据不会被后台重试重复发送"""
+    posts = []
+
+    async def scenario():
+        outbox = PushOutbox(str(tmp_path / "outbox.db"), lease=1.0)
+        async with _recording_client(posts) as client:
+            senders = SenderCache(client)
+            worker = OutboxWorker(outbox, senders)
+            queue = PushQueue(worker, senders, consumers=1)
+            queue.start()
+            for batch in range(2):
+                await queue.put("test", [
+                    ParsedItem(f"t{batch}-{i}", f"https://example.com/{batch}/{i}", "test") for i in range(3)
+                ])
+            drained = asyncio.create_task(queue._queue.join())
+            while not drained.done():
+                await worker.run_once()
+                await asyncio.sleep(0.2)
+            await queue.stop()
+        stats = outbox.stats()
+        outbox.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert len(posts) == 6
+    assert stats["delivered"] == 6 and stats["pending"] == 0
+
+
+def test_handoff_releases_undelivered_entries(tmp_path, wechat_target):
+    """暂存的数据在 stop 或下次 start 时放回发件箱，由后台重试投递"""
+
+    async def scenario():
+        outbox = PushOutbox(str(tmp_path / "outbox.db"))
+        async with httpx.AsyncClient() as client:
+            senders = SenderCache(client)
+            queue = PushQueue(OutboxWorker(outbox, senders), senders)
+            await queue.put("test", [ParsedItem("t", "https://example.com/1", "test")])
+            held = outbox.claim_due()
+            await queue.stop(timeout=0.1)
+            released = outbox.claim_due()
+
+            outbox.enqueue("test", [{"title": "t", "url": "https://example.com/2"}], hold=True)
+            queue.start()
+            restarted = outbox.claim_due()
+            await queue.stop(timeout=0.1)
+        outbox.close()
+        return held, released, restarted
+
+    held, released, restarted = asyncio.run(scenario())
+    assert held == []
+    assert [entry.item["url"] for entry in released] == ["https://example.com/1"]
+    assert [entry.item["url"] for entry in restarted] == ["https://example.com/2"]